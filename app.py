@@ -5,16 +5,22 @@
 import streamlit as st
 
 from config import PAGE_CONFIG
+from profiling import start_rerun, finish_rerun
 from ui_components import (
     setup_page_style,
     render_header,
     render_data_input_page,
-    render_reports_page
+    render_reports_page,
+    render_overview_page,
+    render_search_page,
+    render_diagnostics_panel
 )
 
 
 def main():
     """Главная функция приложения"""
+    start_rerun()
+    
     # Настройка страницы
     st.set_page_config(**PAGE_CONFIG)
     setup_page_style()
@@ -25,7 +31,7 @@ def main():
     # Боковое меню
     menu = st.sidebar.radio(
         "Выберите раздел:",
-        ["Ввод данных", "Отчеты"]
+        ["Ввод данных", "Отчеты", "Обзор", "Поиск"]
     )
     
     # Маршрутизация по разделам
@@ -33,6 +39,15 @@ def main():
         render_data_input_page()
     elif menu == "Отчеты":
         render_reports_page()
+    elif menu == "Обзор":
+        render_overview_page()
+    elif menu == "Поиск":
+        render_search_page()
+    
+    # Замеры перезапуска (только если включены в PROFILING_ENABLED)
+    report = finish_rerun(menu)
+    if report is not None:
+        render_diagnostics_panel(report)
 
 
 if __name__ == "__main__":
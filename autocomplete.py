@@ -0,0 +1,142 @@
+"""
+Модуль значений автозаполнения полей отчета
+"""
+
+import json
+import threading
+from config import AUTOCOMPLETE_FILE, AUTOCOMPLETE_LOCK_FILE
+from file_utils import file_fingerprint, replace_file, file_lock
+from change_watcher import watch_files, watched_state, refresh_state
+from profiling import profiled
+
+
+# Кэш значений автозаполнения: (отпечаток файла, словарь)
+_autocomplete_cache = None
+_autocomplete_lock = threading.Lock()
+
+# Файл автозаполнения могут менять и другие процессы приложения
+watch_files("autocomplete", lambda: file_fingerprint(AUTOCOMPLETE_FILE))
+
+
+@profiled
+def load_default_values() -> dict:
+    """
+    Загружает последние значения по умолчанию для каждого направления
+    
+    Файл читается только при изменении, иначе словарь отдается из памяти;
+    изменения, сделанные другими процессами, замечаются фоновым опросом
+    (см. change_watcher). Возвращаемый словарь общий для всех сессий,
+    его нельзя изменять.
+    
+    Returns:
+        dict: Словарь вида {direction: {field_name: last_value}}
+    """
+    global _autocomplete_cache
+    
+    cached = _autocomplete_cache
+    if cached is not None and cached[0] == watched_state("autocomplete"):
+        return cached[1]
+    
+    fingerprint = refresh_state("autocomplete")
+    default_values = _read_default_values_file() if fingerprint is not None else {}
+    _autocomplete_cache = (fingerprint, default_values)
+    return default_values
+
+
+@profiled(reads_file=True)
+def _read_default_values_file() -> dict:
+    """
+    Читает файл значений автозаполнения
+    
+    Returns:
+        dict: Словарь вида {direction: {field_name: last_value}}; пустой,
+            если файл поврежден
+    """
+    try:
+        with open(AUTOCOMPLETE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def save_default_values(default_values: dict) -> None:
+    """
+    Сохраняет последние значения по умолчанию для каждого направления
+    
+    Файл записывается во временный файл и атомарно подменяется, поэтому
+    читатели никогда не видят его недописанным.
+    
+    Args:
+        default_values: Словарь вида {direction: {field_name: last_value}}
+    """
+    global _autocomplete_cache
+    
+    def write(path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(default_values, f, ensure_ascii=False, indent=2)
+    
+    replace_file(AUTOCOMPLETE_FILE, write)
+    
+    _autocomplete_cache = (refresh_state("autocomplete"), default_values)
+
+
+@profiled
+def update_default_values(direction: str, values: dict[str, str]) -> None:
+    """
+    Обновляет последние значения полей направления одной записью в файл
+    
+    Args:
+        direction: Название направления
+        values: Словарь вида {field_name: value}; пустые значения пропускаются
+    """
+    values = {
+        field_name: value
+        for field_name, value in values.items()
+        if value and value.strip()
+    }
+    if not values:
+        return
+    
+    # Чтение и запись файла не должны перемежаться с другими потоками и процессами
+    with _autocomplete_lock, file_lock(AUTOCOMPLETE_LOCK_FILE):
+        # Дополняем актуальный файл: его мог изменить другой процесс
+        refresh_state("autocomplete")
+        # Копируем, чтобы не менять словарь, который читают другие сессии
+        default_values = dict(load_default_values())
+        direction_values = default_values.get(direction)
+        if not isinstance(direction_values, dict):
+            direction_values = {}
+        default_values[direction] = {**direction_values, **values}
+        
+        save_default_values(default_values)
+
+
+def update_default_value(direction: str, field_name: str, value: str) -> None:
+    """
+    Обновляет последнее значение для конкретного направления и поля
+    
+    Args:
+        direction: Название направления
+        field_name: Название поля
+        value: Новое значение
+    """
+    update_default_values(direction, {field_name: value})
+
+
+@profiled
+def get_default_value(direction: str, field_name: str) -> str:
+    """
+    Получает последнее значение для конкретного направления и поля
+    
+    Args:
+        direction: Название направления
+        field_name: Название поля
+        
+    Returns:
+        str: Последнее значение или пустая строка
+    """
+    default_values = load_default_values()
+    direction_values = default_values.get(direction, {})
+    if not isinstance(direction_values, dict):
+        return ""
+    return direction_values.get(field_name, "")
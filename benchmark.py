@@ -0,0 +1,375 @@
+"""
+Нагрузочные замеры путей загрузки, сохранения и отображения данных
+
+Скрипт генерирует синтетический набор отчетов заданного размера во временной
+папке, замеряет время основных путей (load_data, сохранение отчета из формы,
+вкладка отчетов, построение диаграмм) и холодного старта приложения без
+запуска браузера и выводит результаты в формате JSON.
+
+Пример:
+    python benchmark.py --months 36 --resubmission-rate 0.3 --output bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import subprocess
+import platform
+import statistics
+import tempfile
+from typing import TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    # pandas загружается только внутри функций замеров
+    import pandas as pd
+
+
+# Слова для генерации длинных текстовых полей
+TEXT_WORDS = [
+    "развитие", "рынок", "заказчик", "поставка", "производство", "оборудование",
+    "стратегия", "финансирование", "проект", "решение", "партнер", "сертификация",
+    "импортозамещение", "пилот", "масштабирование", "команда", "продажи", "сервис"
+]
+
+# Папка приложения (для запуска app.py и копирования файла автозаполнения)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Тяжелые модули, загрузка которых проверяется при холодном старте.
+# plotly.graph_objects загружает уже сам streamlit (1.65), поэтому он виден
+# загруженным после импорта приложения независимо от страницы
+HEAVY_MODULES = ["pandas", "data_manager", "visualization", "plotly.graph_objects"]
+
+# Замер холодного старта в отдельном процессе: импорт app.py, первая
+# отрисовка страницы ввода данных и первое открытие страницы отчетов
+COLD_START_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {app_dir!r})
+import config
+config.STORAGE_MODE = {storage_mode!r}
+
+start = time.perf_counter()
+import app
+import_time = time.perf_counter() - start
+after_import = {{name: name in sys.modules for name in {modules!r}}}
+
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(app.__file__, default_timeout={timeout!r})
+start = time.perf_counter()
+at.run()
+first_paint = time.perf_counter() - start
+after_first_paint = {{name: name in sys.modules for name in {modules!r}}}
+
+at.sidebar.radio[0].set_value("Отчеты")
+start = time.perf_counter()
+at.run()
+reports_first_open = time.perf_counter() - start
+
+print(json.dumps({{
+    "import_app": import_time,
+    "first_paint_data_input": first_paint,
+    "first_open_reports": reports_first_open,
+    "loaded_after_import": after_import,
+    "loaded_after_first_paint": after_first_paint
+}}))
+"""
+
+
+def generate_text(rng: random.Random, length: int) -> str:
+    """
+    Генерирует текст из случайных слов
+    
+    Args:
+        rng: Генератор случайных чисел
+        length: Примерная длина текста в символах
+        
+    Returns:
+        str: Сгенерированный текст
+    """
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(TEXT_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def generate_dataset(months: int, resubmission_rate: float, text_length: int,
+                     seed: int = 0) -> "pd.DataFrame":
+    """
+    Генерирует синтетический набор отчетов в формате колонок load_data
+    
+    Для каждого направления из CATEGORIES создается по отчету за каждый
+    из последних months месяцев; с вероятностью resubmission_rate отчет
+    за месяц отправляется повторно.
+    
+    Args:
+        months: Число месяцев истории
+        resubmission_rate: Доля повторно отправленных отчетов (от 0 до 1)
+        text_length: Длина текстовых полей в символах
+        seed: Начальное значение генератора случайных чисел
+        
+    Returns:
+        pd.DataFrame: Сгенерированные отчеты
+    """
+    import pandas as pd
+    from data_manager import REPORT_COLUMNS, recompute_derived
+    
+    rng = random.Random(seed)
+    periods = pd.period_range(end=pd.Period.now("M"), periods=months, freq="M")
+    directions = [d for directions in config.CATEGORIES.values() for d in directions]
+    
+    records = []
+    for month in periods:
+        for direction in directions:
+            for _ in range(1 + (rng.random() < resubmission_rate)):
+                record = {
+                    "Направление": direction,
+                    "Месяц": str(month),
+                    "Стадия": rng.choice(config.STAGE_OPTIONS)
+                }
+                record.update({metric: rng.randint(0, 10) for metric in config.METRICS})
+                record.update({
+                    metric: round(rng.uniform(0, 1000), 2)
+                    for metric in config.NUMERIC_METRICS
+                })
+                record.update({
+                    field: generate_text(rng, text_length)
+                    for field in [config.TEXT_METRIC] + config.NEW_TEXT_FIELDS
+                })
+                records.append(record)
+    
+    return recompute_derived(pd.DataFrame.from_records(records, columns=REPORT_COLUMNS))
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    """
+    Замеряет время выполнения функции
+    
+    Args:
+        func: Замеряемая функция без аргументов
+        repeat: Число замеров
+        setup: Функция, вызываемая перед каждым замером (не входит во время)
+        
+    Returns:
+        dict: Число замеров и время в секундах (min, median, mean, max)
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def summarize(timings: list[float]) -> dict:
+    """
+    Сводит замеры времени в статистику
+    
+    Args:
+        timings: Замеры в секундах
+        
+    Returns:
+        dict: Число замеров и время в секундах (min, median, mean, max)
+    """
+    return {
+        "runs": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings)
+    }
+
+
+def measure_cold_start(repeat: int, timeout: float) -> dict:
+    """
+    Замеряет холодный старт приложения в новых процессах Python
+    
+    Args:
+        repeat: Число запусков
+        timeout: Время ожидания одного прогона приложения, с
+        
+    Returns:
+        dict: Статистика по этапам старта и загруженные тяжелые модули
+            (по последнему запуску)
+    """
+    script = COLD_START_SCRIPT.format(
+        app_dir=APP_DIR,
+        storage_mode=config.STORAGE_MODE,
+        modules=HEAVY_MODULES,
+        timeout=timeout
+    )
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    
+    stages = ["import_app", "first_paint_data_input", "first_open_reports"]
+    result = {stage: summarize([run[stage] for run in runs]) for stage in stages}
+    result["loaded_after_import"] = runs[-1]["loaded_after_import"]
+    result["loaded_after_first_paint"] = runs[-1]["loaded_after_first_paint"]
+    return result
+
+
+def run_benchmarks(args: argparse.Namespace) -> dict:
+    """
+    Генерирует данные и замеряет все пути
+    
+    Args:
+        args: Параметры командной строки
+        
+    Returns:
+        dict: Параметры запуска, окружение и результаты замеров
+    """
+    import pandas as pd
+    import plotly
+    import streamlit
+    from streamlit.testing.v1 import AppTest
+    import data_manager
+    import visualization
+    
+    df = generate_dataset(args.months, args.resubmission_rate, args.text_length, args.seed)
+    data_manager.save_data(df)
+    
+    category_label = next(iter(config.CATEGORIES))
+    direction = config.CATEGORIES[category_label][0]
+    metrics_values = df[config.METRICS].iloc[0].tolist()
+    
+    def drop_data_caches():
+        data_manager._invalidate_cache()
+        data_manager._latest_index = None
+    
+    results = {}
+    results["load_data_cold"] = measure(data_manager.load_data, args.repeat, drop_data_caches)
+    results["load_data_warm"] = measure(data_manager.load_data, args.repeat)
+    
+    rollup = data_manager.get_direction_rollup(direction, config.NUMERIC_METRICS[0])["mean"]
+    results["create_radar_chart_cold"] = measure(
+        lambda: visualization.create_radar_chart(metrics_values),
+        args.repeat,
+        visualization._build_radar_chart.cache_clear
+    )
+    results["create_radar_chart_warm"] = measure(
+        lambda: visualization.create_radar_chart(metrics_values), args.repeat
+    )
+    results["create_bar_chart_cold"] = measure(
+        lambda: visualization.create_bar_chart(rollup, config.NUMERIC_METRICS[0]),
+        args.repeat,
+        visualization._build_bar_chart.cache_clear
+    )
+    results["create_bar_chart_warm"] = measure(
+        lambda: visualization.create_bar_chart(rollup, config.NUMERIC_METRICS[0]),
+        args.repeat
+    )
+    
+    # Сохранение отчета из формы ввода
+    app = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=args.timeout)
+    app.run()
+    save_button = app.button(key=f"save_{category_label}")
+    results["save_report"] = measure(app.run, args.repeat, save_button.click)
+    
+    # Вкладка отчетов: первый показ после изменения данных и повторный показ
+    app.sidebar.radio[0].set_value("Отчеты")
+    results["render_reports_tab_cold"] = measure(
+        app.run, args.repeat, lambda: (drop_data_caches(), _clear_figure_caches(visualization))
+    )
+    results["render_reports_tab_warm"] = measure(app.run, args.repeat)
+    
+    results["cold_start"] = measure_cold_start(args.repeat, args.timeout)
+    
+    return {
+        "params": {
+            "months": args.months,
+            "resubmission_rate": args.resubmission_rate,
+            "text_length": args.text_length,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "storage_mode": config.STORAGE_MODE,
+            "rows": len(df),
+            "directions": int(df["Направление"].nunique())
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "plotly": plotly.__version__,
+            "streamlit": streamlit.__version__
+        },
+        "results": results
+    }
+
+
+def _clear_figure_caches(visualization) -> None:
+    """Сбрасывает кэши построенных диаграмм"""
+    visualization._build_radar_chart.cache_clear()
+    visualization._build_bar_chart.cache_clear()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Разбирает параметры командной строки
+    
+    Args:
+        argv: Аргументы (None — аргументы процесса)
+        
+    Returns:
+        argparse.Namespace: Параметры запуска
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--months", type=int, default=24, help="число месяцев истории")
+    parser.add_argument("--resubmission-rate", type=float, default=0.2,
+                        help="доля повторно отправленных отчетов")
+    parser.add_argument("--text-length", type=int, default=500,
+                        help="длина текстовых полей в символах")
+    parser.add_argument("--repeat", type=int, default=5, help="число замеров каждого пути")
+    parser.add_argument("--seed", type=int, default=0, help="начальное значение генератора")
+    parser.add_argument("--storage-mode", choices=["journal", "csv", "sqlite", "parquet"],
+                        default=config.STORAGE_MODE, help="режим хранения данных")
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="время ожидания одного прогона приложения, с")
+    parser.add_argument("--output", help="файл для результатов (по умолчанию stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Точка входа: замеры выполняются во временной папке и не трогают рабочие данные"""
+    args = parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    
+    # Режим хранения задается до импорта модулей приложения
+    config.STORAGE_MODE = args.storage_mode
+    sys.path.insert(0, APP_DIR)
+    
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="akm_benchmark_")
+    try:
+        autocomplete_file = os.path.join(APP_DIR, config.AUTOCOMPLETE_FILE)
+        if os.path.exists(autocomplete_file):
+            shutil.copy(autocomplete_file, work_dir)
+        os.chdir(work_dir)
+        report = run_benchmarks(args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Модуль отслеживания изменений файлов другими процессами приложения
+
+Несколько процессов приложения могут работать с одними и теми же файлами.
+Чтобы не проверять файлы при каждом перезапуске скрипта в каждой сессии,
+один фоновый поток процесса раз в CHANGE_POLL_INTERVAL секунд снимает
+их отпечатки, а кэши сравнивают свой ключ с последним снятым отпечатком
+в памяти. Свои записи процесс учитывает сразу через refresh_state.
+"""
+
+import time
+import threading
+from config import CHANGE_POLL_INTERVAL
+
+
+# Функции снятия отпечатков и последние снятые отпечатки по имени ресурса
+_probes = {}
+_states = {}
+_lock = threading.Lock()
+
+# Фоновый поток опроса (запускается при первом обращении)
+_poll_thread = None
+
+
+def watch_files(name: str, probe) -> None:
+    """
+    Регистрирует отслеживаемый ресурс
+    
+    Args:
+        name: Имя ресурса
+        probe: Функция без аргументов, возвращающая отпечаток файлов ресурса
+    """
+    with _lock:
+        _probes[name] = probe
+        _states.pop(name, None)
+
+
+def watched_state(name: str):
+    """
+    Возвращает последний снятый отпечаток ресурса без обращения к диску
+    
+    При первом обращении (и при выключенном опросе) отпечаток снимается сразу.
+    
+    Args:
+        name: Имя ресурса (см. watch_files)
+        
+    Returns:
+        Отпечаток, возвращенный функцией ресурса
+    """
+    if CHANGE_POLL_INTERVAL <= 0:
+        return refresh_state(name)
+    _ensure_polling()
+    try:
+        return _states[name]
+    except KeyError:
+        return refresh_state(name)
+
+
+def refresh_state(name: str):
+    """
+    Снимает отпечаток ресурса сейчас и запоминает его
+    
+    Вызывается после записи этим процессом и перед чтением, которое
+    должно учесть все изменения (например, перед дополнением файла).
+    
+    Args:
+        name: Имя ресурса (см. watch_files)
+        
+    Returns:
+        Снятый отпечаток
+    """
+    state = _probes[name]()
+    _states[name] = state
+    return state
+
+
+def _ensure_polling() -> None:
+    """Запускает фоновый поток опроса, если он еще не запущен"""
+    global _poll_thread
+    
+    if _poll_thread is not None:
+        return
+    with _lock:
+        if _poll_thread is None:
+            _poll_thread = threading.Thread(
+                target=_poll_loop, name="change-watcher", daemon=True
+            )
+            _poll_thread.start()
+
+
+def _poll_loop() -> None:
+    """Периодически снимает отпечатки всех ресурсов (выполняется в фоновом потоке)"""
+    while True:
+        time.sleep(CHANGE_POLL_INTERVAL)
+        for name in list(_probes):
+            try:
+                refresh_state(name)
+            except OSError:
+                # Файл недоступен в момент опроса: проверим в следующий раз
+                continue
@@ -5,6 +5,47 @@
 # Файл для хранения данных
 DATA_FILE = "metrics_data.csv"
 
+# Режим хранения: "journal" — новые отчеты дописываются в журнал,
+# "csv" — файл данных перезаписывается целиком при каждом сохранении,
+# "sqlite" — отчеты хранятся в базе SQLite (CSV — формат импорта/экспорта),
+# "parquet" — как "journal", но снимок хранится в колоночном формате Parquet
+STORAGE_MODE = "journal"
+
+# Файл базы данных SQLite для режима "sqlite"
+SQLITE_FILE = "metrics_data.db"
+
+# Файл снимка данных в формате Parquet для режима "parquet"
+PARQUET_FILE = "metrics_data.parquet"
+
+# Хранилище длинных текстов отчетов (база SQLite)
+TEXT_STORE_FILE = "metrics_texts.db"
+
+# Файл с версией схемы данных и набором метрик, по которому считались оценки
+DATA_META_FILE = "metrics_meta.json"
+
+# Журнал добавленных отчетов (по одной JSON-записи на строку)
+JOURNAL_FILE = "metrics_journal.jsonl"
+
+# Число записей в журнале, после которого он сжимается в DATA_FILE в фоне
+JOURNAL_COMPACT_THRESHOLD = 500
+
+# Наибольшее число новых отчетов, хранимых в памяти для дочитывания индексами
+# поиска и подсказок: отставший сильнее индекс строится заново
+REPORT_CHANGES_LIMIT = 1000
+
+# Сжатый архив вытесненных версий отчетов (CSV, gzip): в рабочих данных
+# остается только последний отчет по каждой паре (направление, месяц)
+ARCHIVE_FILE = "metrics_archive.csv.gz"
+
+# Файл межпроцессной блокировки записи: процессы приложения, работающие
+# с одними файлами данных, выполняют записи по очереди
+DATA_LOCK_FILE = "metrics_data.lock"
+
+# Период опроса файлов данных и автозаполнения (с): изменения, сделанные
+# другими процессами приложения, становятся видны не позже чем через него.
+# 0 — проверять файлы при каждом обращении
+CHANGE_POLL_INTERVAL = 1.0
+
 # Категории направлений
 CATEGORIES = {
     "Дистрибуция": [
@@ -61,11 +102,27 @@ NEW_TEXT_FIELDS = [
     "Управленческие решения УС (на ближ. полгода)"
 ]
 
+# Длинные текстовые поля: хранятся отдельно от набора данных (TEXT_STORE_FILE)
+# и читаются только для показываемого отчета
+LONG_TEXT_FIELDS = [TEXT_METRIC, NEW_TEXT_FIELDS[1], NEW_TEXT_FIELDS[3], NEW_TEXT_FIELDS[4]]
+
 # Настройки визуализации
 CHART_CONFIG = {
     "displayModeBar": False
 }
 
+# Число построенных диаграмм, хранимых в кэше для повторного отображения
+FIGURE_CACHE_SIZE = 256
+
+# Период проверки новых отчетов на открытой странице отчетов (с):
+# отчеты, сохраненные другими пользователями, появляются без действий
+# пользователя. 0 — не проверять
+REPORTS_REFRESH_INTERVAL = 5
+
+# Замеры времени выполнения функций: панель "Диагностика" в боковом меню
+# и журнал akm_dashboard.profiling. Выключенные замеры не замедляют работу
+PROFILING_ENABLED = False
+
 # Цветовая схема
 COLORS = {
     "background": "#0e1117",
@@ -74,7 +131,8 @@ COLORS = {
     "primary_fill": "rgba(173, 216, 230, 0.4)",
     "line": "lightblue",
     "text": "white",
-    "grid": "gray"
+    "grid": "gray",
+    "heatmap": ["#1c1f26", "lightblue"]
 }
 
 # Настройки страницы
@@ -85,3 +143,24 @@ PAGE_CONFIG = {
 
 # Файл для хранения истории автозаполнения
 AUTOCOMPLETE_FILE = "autocomplete_data.json"
+
+# Файл межпроцессной блокировки обновления значений автозаполнения
+AUTOCOMPLETE_LOCK_FILE = "autocomplete_data.lock"
+
+# Поля с подсказками ранее введенных значений: однострочные поля
+# NEW_TEXT_FIELDS (длинные тексты вводятся свободно)
+SUGGESTION_FIELDS = [field for field in NEW_TEXT_FIELDS if field not in LONG_TEXT_FIELDS]
+
+# Подсказки полей SUGGESTION_FIELDS: число вариантов в списке и длина
+# индексируемого начала значения (более длинный ввод проверяется по списку)
+SUGGESTION_LIMIT = 50
+SUGGESTION_PREFIX_LENGTH = 20
+
+# Период полураспада веса значения в подсказках (месяцы): использование
+# полгода назад весит вдвое меньше использования в текущем месяце
+SUGGESTION_HALF_LIFE_MONTHS = 6
+
+# Поиск по текстовым полям отчетов: число результатов на странице
+# и длина фрагмента текста с найденным словом (символы)
+SEARCH_RESULT_LIMIT = 50
+SEARCH_SNIPPET_LENGTH = 200
@@ -3,74 +3,2270 @@
 """
 
 import os
+import gzip
+import atexit
 import json
+import io
+import zlib
+import itertools
+import logging
+from bisect import bisect_left, bisect_right, insort
+import queue
+import sqlite3
+import threading
+from datetime import date
+from concurrent.futures import Future
+from contextlib import contextmanager
 import pandas as pd
 from config import (
     DATA_FILE,
+    STORAGE_MODE,
+    SQLITE_FILE,
+    PARQUET_FILE,
+    DATA_META_FILE,
+    ARCHIVE_FILE,
+    DATA_LOCK_FILE,
+    JOURNAL_FILE,
+    JOURNAL_COMPACT_THRESHOLD,
+    REPORT_CHANGES_LIMIT,
+    CATEGORIES,
     METRICS,
     NUMERIC_METRICS,
     TEXT_METRIC,
     STAGE_OPTIONS,
     NEW_TEXT_FIELDS,
-    AUTOCOMPLETE_FILE
+    LONG_TEXT_FIELDS
 )
+from file_utils import file_fingerprint, replace_file, file_lock
+from change_watcher import watch_files, watched_state, refresh_state
+from text_store import store_texts, get_texts
+from profiling import profiled
+# Значения автозаполнения и общая оценка не требуют pandas и вынесены
+# в отдельные модули; импорт здесь сохраняет прежний интерфейс модуля
+from autocomplete import (
+    load_default_values,
+    save_default_values,
+    update_default_values,
+    update_default_value,
+    get_default_value
+)
+from scores import calculate_overall_score
+
+# Открытый интерфейс модуля, включая имена из autocomplete и scores,
+# которые модуль отдает как свои
+__all__ = [
+    # Схема данных
+    "REPORT_COLUMNS",
+    "TEXT_REF_COLUMN",
+    "DATA_COLUMNS",
+    "SCHEMA_VERSION",
+    "DERIVED_COLUMNS",
+    "OVERVIEW_METRICS",
+    "ARCHIVED_AT_COLUMN",
+    "NUMERIC_COLUMNS",
+    "TEXT_COLUMNS",
+    "DIRECTION_CATEGORIES",
+    "DATA_SCHEMA",
+    "JOURNAL_COMPACTING_FILE",
+    "GZIP_MAGIC",
+    "parse_months",
+    "normalize_month",
+    "apply_schema",
+    "recompute_derived",
+    "migrate_data",
+    "create_data_row",
+    # Чтение и запись
+    "load_data",
+    "save_data",
+    "append_report",
+    "compact_journal",
+    "compact_history",
+    "get_archived_revisions",
+    # Представления отчетов
+    "get_reports_version",
+    "get_report_changes",
+    "has_reports",
+    "get_undated_reports",
+    "get_report_directions",
+    "get_report_months",
+    "get_last_months",
+    "get_report",
+    "get_latest_reports",
+    "get_overview",
+    "get_direction_history",
+    "get_report_revisions",
+    "get_report_texts",
+    "with_texts",
+    "get_direction_rollup",
+    "get_category_rollup",
+    # Импорт и выгрузка
+    "read_reports_file",
+    "validate_reports",
+    "import_reports",
+    "import_csv",
+    "convert_csv_to_parquet",
+    "export_csv",
+    # Значения автозаполнения и общая оценка
+    "load_default_values",
+    "save_default_values",
+    "update_default_values",
+    "update_default_value",
+    "get_default_value",
+    "calculate_overall_score"
+]
+
+
+# Колонки отчета: формат ввода, импорта и выгрузки
+REPORT_COLUMNS = (
+    ["Направление", "Месяц", "Стадия"] +
+    METRICS +
+    ["Общая цифра"] +
+    NUMERIC_METRICS +
+    [TEXT_METRIC] +
+    NEW_TEXT_FIELDS
+)
+
+# Колонка со ссылкой на тексты отчета в хранилище текстов (text_store)
+TEXT_REF_COLUMN = "Ключ текстов"
+
+# Колонки набора данных в порядке хранения: длинные тексты заменены ссылкой
+DATA_COLUMNS = [col for col in REPORT_COLUMNS if col not in LONG_TEXT_FIELDS] + [TEXT_REF_COLUMN]
+
+# Версия схемы данных. Увеличивается при изменении правил расчета
+# производных колонок или структуры данных (см. migrate_data)
+SCHEMA_VERSION = 3
+
+# Производные колонки и правила их расчета по всему набору данных
+DERIVED_COLUMNS = {
+    "Общая цифра": lambda df: df[METRICS].mean(axis=1).round(2)
+}
+
+# Метрики сводной карты направлений по месяцам (см. get_overview)
+OVERVIEW_METRICS = ["Общая цифра"] + NUMERIC_METRICS
+
+# Колонка архива с временем переноса версии отчета
+ARCHIVED_AT_COLUMN = "Дата архивации"
+
+# Числовые колонки набора данных
+NUMERIC_COLUMNS = METRICS + ["Общая цифра"] + NUMERIC_METRICS
+
+# Текстовые колонки набора данных (короткие тексты хранятся в нем самом)
+TEXT_COLUMNS = [field for field in [TEXT_METRIC] + NEW_TEXT_FIELDS if field not in LONG_TEXT_FIELDS]
+
+# Категория каждого направления
+DIRECTION_CATEGORIES = {
+    direction: category_label
+    for category_label, directions in CATEGORIES.items()
+    for direction in directions
+}
+
+# Типизированная схема набора данных: колонка -> тип pandas
+DATA_SCHEMA = {
+    "Направление": pd.CategoricalDtype(
+        [direction for directions in CATEGORIES.values() for direction in directions]
+    ),
+    "Месяц": pd.PeriodDtype("M"),
+    "Стадия": pd.CategoricalDtype(STAGE_OPTIONS),
+    **{metric: "float32" for metric in METRICS + ["Общая цифра"]},
+    **{metric: "float64" for metric in NUMERIC_METRICS},
+    **{field: "string" for field in TEXT_COLUMNS},
+    TEXT_REF_COLUMN: "Int64"
+}
+
+# Журнал, отложенный на время сжатия: записи из него переносятся в снимок,
+# а новые отчеты дописываются в новый JOURNAL_FILE
+JOURNAL_COMPACTING_FILE = JOURNAL_FILE + ".compacting"
+
+# Журнал ошибок фоновых операций записи (их результат никто не ожидает)
+logger = logging.getLogger("akm_dashboard.data_manager")
+
+# Начало каждого блока gzip в архиве (сигнатура и метод сжатия deflate)
+GZIP_MAGIC = b"\x1f\x8b\x08"
+
+# Очередь операций записи и единственный поток, который их выполняет
+_write_queue = queue.Queue()
+_writer_thread = None
+_writer_start_lock = threading.Lock()
+
+# Число записей в журнале (None — еще не подсчитано)
+_journal_rows = None
+
+# Поставлено ли сжатие журнала в очередь записи
+_compaction_pending = False
+
+# Общий для всех сессий кэш набора данных: (отпечаток файлов, DataFrame)
+_data_cache = None
+_cache_lock = threading.Lock()
+
+# Создана ли в этом процессе схема базы SQLite
+_sqlite_ready = False
+
+# Проверена ли в этом процессе версия схемы данных
+_schema_checked = False
+
+# Представление последних отчетов по (направлению, месяцу)
+_latest_index = None
+_index_lock = threading.Lock()
+
+# Номера построений представления (см. get_reports_version)
+_index_generations = itertools.count()
+
+
+
+def _as_category(series: pd.Series, dtype: pd.CategoricalDtype) -> pd.Series:
+    """
+    Приводит колонку к категориальному типу, не теряя значений вне схемы
+    
+    Args:
+        series: Исходная колонка
+        dtype: Категориальный тип из схемы
+        
+    Returns:
+        pd.Series: Категориальная колонка
+    """
+    categories = list(dtype.categories)
+    known = set(categories)
+    extra = [value for value in series.dropna().unique() if value not in known]
+    return series.astype(object).astype(pd.CategoricalDtype(categories + list(extra)))
+
+
+def parse_months(values: pd.Series) -> pd.Series:
+    """
+    Преобразует значения месяца в формате YYYY-MM в месячные периоды
+    
+    Значения-даты (ячейки XLSX с датой) приводятся к месяцу даты.
+    
+    Args:
+        values: Колонка со значениями месяца
+        
+    Returns:
+        pd.Series: Колонка типа period[M]; нераспознанные значения становятся NaT
+    """
+    if isinstance(values.dtype, pd.PeriodDtype):
+        return values
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values.dt.to_period("M")
+    
+    # Excel хранит введенный месяц (например, 2025-08) как дату: такие ячейки
+    # приходят из XLSX значениями datetime, строгий формат — только для строк
+    if values.dtype == object:
+        is_date = values.map(lambda value: isinstance(value, date))
+    else:
+        is_date = pd.Series(False, index=values.index)
+    dates = pd.to_datetime(values.mask(is_date).astype("string"), format="%Y-%m", errors="coerce")
+    months = dates.dt.to_period("M")
+    if is_date.any():
+        months[is_date] = pd.to_datetime(values[is_date]).dt.to_period("M")
+    return months
+
+
+def normalize_month(value: str) -> str:
+    """
+    Проверяет месяц отчета и приводит его к виду YYYY-MM
+    
+    Args:
+        value: Месяц, введенный пользователем (например, "2025-8")
+        
+    Returns:
+        str: Месяц в формате YYYY-MM
+        
+    Raises:
+        ValueError: Если значение не является месяцем в формате YYYY-MM
+    """
+    month = parse_months(pd.Series([value]))[0]
+    if pd.isna(month):
+        raise ValueError(f"Месяц '{value}' должен быть в формате YYYY-MM")
+    return str(month)
+
+
+def _sort_reports(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Упорядочивает отчеты по направлению (в порядке CATEGORIES) и месяцу
+    
+    Сортировка устойчивая: повторные отчеты за месяц сохраняют порядок
+    добавления, поэтому последний из них остается последним.
+    
+    Args:
+        df: DataFrame с отчетами
+        
+    Returns:
+        pd.DataFrame: Отсортированный DataFrame с новым индексом
+    """
+    def sort_key(column: pd.Series) -> pd.Series:
+        if column.name == "Направление":
+            return _as_category(column, DATA_SCHEMA["Направление"]).cat.codes
+        return parse_months(column)
+    
+    return df.sort_values(
+        ["Направление", "Месяц"], key=sort_key, kind="stable", ignore_index=True
+    )
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приводит DataFrame к типизированной схеме DATA_SCHEMA
+    
+    Недостающие колонки добавляются пустыми, лишние сохраняются без изменений.
+    
+    Args:
+        df: Исходный DataFrame
+        
+    Returns:
+        pd.DataFrame: DataFrame с типами колонок из схемы
+    """
+    df = df.copy()
+    for col, dtype in DATA_SCHEMA.items():
+        if col not in df.columns:
+            df[col] = None
+        if df[col].dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = _as_category(df[col], dtype)
+        elif isinstance(dtype, pd.PeriodDtype):
+            df[col] = parse_months(df[col])
+        elif col in NUMERIC_COLUMNS or col == TEXT_REF_COLUMN:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _serialize_rows(df: pd.DataFrame) -> list[dict]:
+    """
+    Преобразует строки DataFrame в записи из значений Python для JSON и SQL
+    
+    Args:
+        df: DataFrame со строками
+        
+    Returns:
+        list[dict]: Записи вида {колонка: значение}, пропуски заменены на None
+    """
+    rows = df.reindex(columns=DATA_COLUMNS)
+    if isinstance(rows["Месяц"].dtype, pd.PeriodDtype):
+        rows["Месяц"] = rows["Месяц"].dt.strftime("%Y-%m")
+    return rows.astype(object).where(rows.notna(), None).to_dict("records")
+
+
+def _uses_journal() -> bool:
+    """Проверяет, дописываются ли отчеты в журнал в текущем режиме хранения"""
+    return STORAGE_MODE in ("journal", "parquet")
+
+
+def _snapshot_file() -> str:
+    """Возвращает путь к файлу снимка данных для текущего режима хранения"""
+    return PARQUET_FILE if STORAGE_MODE == "parquet" else DATA_FILE
+
+
+@profiled(reads_file=True)
+def _read_snapshot(columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Читает снимок данных из CSV или Parquet файла
+    
+    Args:
+        columns: Колонки для чтения (None — все)
+        
+    Returns:
+        pd.DataFrame: DataFrame со снимком или пустой DataFrame с нужными колонками
+    """
+    path = _snapshot_file()
+    if os.path.exists(path):
+        if STORAGE_MODE == "parquet":
+            if columns is not None:
+                available = set(_parquet_columns(path))
+                columns = [col for col in columns if col in available]
+            return pd.read_parquet(path, columns=columns)
+        usecols = (lambda col: col in columns) if columns is not None else None
+        try:
+            return pd.read_csv(
+                path,
+                usecols=usecols,
+                dtype={
+                    col: DATA_SCHEMA[col]
+                    for col in NUMERIC_COLUMNS + TEXT_COLUMNS + [TEXT_REF_COLUMN]
+                }
+            )
+        except pd.errors.EmptyDataError:
+            pass
+        except ValueError:
+            # В файле есть нечисловое значение в числовой колонке (например,
+            # исправленное вручную "1,5"): такие значения становятся пропусками
+            # при приведении к схеме
+            return pd.read_csv(path, usecols=usecols, dtype=object)
+    return pd.DataFrame(columns=DATA_COLUMNS if columns is None else columns)
+
+
+def _parquet_columns(path: str) -> list[str]:
+    """
+    Возвращает имена колонок Parquet файла без чтения данных
+    
+    Args:
+        path: Путь к Parquet файлу
+        
+    Returns:
+        list[str]: Имена колонок
+    """
+    import pyarrow.parquet as pq
+    return pq.read_schema(path).names
+
+
+def _write_snapshot(df: pd.DataFrame) -> None:
+    """
+    Записывает снимок данных в CSV или Parquet файл
+    
+    Строки снимка хранятся упорядоченными по направлению и месяцу.
+    
+    Args:
+        df: DataFrame для сохранения
+    """
+    df = _sort_reports(df)
+    if STORAGE_MODE == "parquet":
+        replace_file(PARQUET_FILE, lambda path: apply_schema(df).to_parquet(path, index=False))
+    else:
+        replace_file(DATA_FILE, lambda path: df.to_csv(path, index=False))
+
+
+@profiled(reads_file=True)
+def _read_journal(path: str = JOURNAL_FILE) -> list[dict]:
+    """
+    Читает записи журнала добавленных отчетов
+    
+    Args:
+        path: Файл журнала (JOURNAL_FILE или JOURNAL_COMPACTING_FILE)
+        
+    Returns:
+        list[dict]: Список записей в порядке добавления
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Недописанная строка после аварийного завершения
+                continue
+    return records
+
+
+@profiled(reads_file=True)
+def _read_journal_tail(offset: int) -> tuple[list[dict], int]:
+    """
+    Читает записи журнала, дописанные после указанного смещения
+    
+    Недописанная последняя строка не читается: она будет прочитана
+    при следующем вызове.
+    
+    Args:
+        offset: Смещение в байтах конца уже прочитанных строк
+        
+    Returns:
+        tuple[list[dict], int]: Записи в порядке добавления и смещение конца
+            прочитанных строк
+    """
+    with open(JOURNAL_FILE, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    
+    records = []
+    for line in data[:end].decode('utf-8', errors='replace').splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records, offset + end
+
+
+def _read_journals() -> list[dict]:
+    """
+    Читает записи журнала вместе с журналом, отложенным на время сжатия
+    
+    Returns:
+        list[dict]: Записи в порядке добавления
+    """
+    return _read_journal(JOURNAL_COMPACTING_FILE) + _read_journal()
+
+
+def _data_fingerprint() -> tuple:
+    """Возвращает отпечаток всех файлов, из которых собирается набор данных"""
+    if STORAGE_MODE == "sqlite":
+        return (file_fingerprint(SQLITE_FILE), file_fingerprint(SQLITE_FILE + "-wal"))
+    return (
+        file_fingerprint(_snapshot_file()),
+        file_fingerprint(JOURNAL_FILE),
+        file_fingerprint(JOURNAL_COMPACTING_FILE)
+    )
+
+
+# Файлы набора данных могут менять и другие процессы приложения
+watch_files("data", _data_fingerprint)
+
+
+def _current_fingerprint() -> tuple:
+    """
+    Возвращает отпечаток файлов набора данных для проверки кэшей
+    
+    Поток записи снимает отпечаток с диска, чтобы дополнять данные с учетом
+    записей других процессов; остальные потоки берут последний отпечаток
+    фонового опроса и не обращаются к диску.
+    """
+    if threading.current_thread() is _writer_thread:
+        return refresh_state("data")
+    return watched_state("data")
+
+
+def _read_position() -> tuple | None:
+    """
+    Возвращает позицию конца сохраненных строк, с которой можно дочитывать новые
+    
+    Returns:
+        tuple | None: ("sqlite", версия схемы базы, последний id строки) или
+            ("journal", отпечаток снимка, inode журнала, размер журнала);
+            None в режиме "csv", где файл перезаписывается целиком
+    """
+    if STORAGE_MODE == "sqlite":
+        with _sqlite_connection() as conn:
+            schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            last_id = conn.execute("SELECT MAX(id) FROM reports").fetchone()[0]
+        return ("sqlite", schema_version, last_id or 0)
+    if not _uses_journal():
+        return None
+    snapshot, journal, compacting = _data_fingerprint()
+    if journal is None:
+        return ("journal", (snapshot, compacting), None, 0)
+    return ("journal", (snapshot, compacting), journal[0], journal[1])
+
+
+def _read_new_rows(position: tuple | None) -> tuple[list[dict], tuple] | None:
+    """
+    Дочитывает строки, добавленные в хранилище после позиции
+    
+    Args:
+        position: Позиция конца уже прочитанных строк (см. _read_position)
+        
+    Returns:
+        tuple[list[dict], tuple] | None: Новые записи с типами схемы и новая
+            позиция; None, если данные изменились не только добавлением строк
+            (перезапись файла, сжатие журнала, пересоздание таблицы)
+    """
+    if position is None:
+        return None
+    
+    if position[0] == "sqlite":
+        _, schema_version, last_id = position
+        columns_sql = ", ".join(_quote(c) for c in DATA_COLUMNS)
+        with _sqlite_connection() as conn:
+            if conn.execute("PRAGMA schema_version").fetchone()[0] != schema_version:
+                return None
+            new_rows = pd.read_sql_query(
+                f"SELECT id, {columns_sql} FROM reports WHERE id > ? ORDER BY id",
+                conn,
+                params=(last_id,)
+            )
+        if new_rows.empty:
+            return [], position
+        last_id = int(new_rows["id"].max())
+        return _typed_records(new_rows.drop(columns="id")), ("sqlite", schema_version, last_id)
+    
+    _, snapshot, inode, offset = position
+    current_snapshot, journal, compacting = _data_fingerprint()
+    if (current_snapshot, compacting) != snapshot:
+        return None
+    if journal is None:
+        return ([], position) if offset == 0 else None
+    if (inode is not None and journal[0] != inode) or journal[1] < offset:
+        return None
+    records, end = _read_journal_tail(offset)
+    typed = _typed_records(pd.DataFrame.from_records(records)) if records else []
+    return typed, ("journal", snapshot, journal[0], end)
+
+
+def _invalidate_cache() -> None:
+    """Сбрасывает общий кэш набора данных после записи этим процессом"""
+    global _data_cache
+    _data_cache = None
+    refresh_state("data")
+
+
+@profiled
+def load_data(columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Загружает данные из хранилища и журнала добавленных отчетов
+    
+    Результат кэшируется на уровне процесса и разделяется всеми сессиями,
+    пока не изменятся файлы данных; изменения, сделанные другими процессами,
+    замечаются фоновым опросом (см. change_watcher). Возвращаемый DataFrame
+    нельзя изменять.
+    Типы колонок соответствуют схеме DATA_SCHEMA.
+    
+    Args:
+        columns: Колонки для загрузки (None — все). Если полный набор еще
+            не в кэше, с диска читаются только указанные колонки.
+        
+    Returns:
+        pd.DataFrame: DataFrame с данными или пустой DataFrame с нужными колонками
+    """
+    _ensure_migrated()
+    if columns is not None:
+        cached = _data_cache
+        if cached is not None and cached[0] == _current_fingerprint():
+            return cached[1][columns]
+        return _read_data(columns)
+    
+    return _load_cached_data()[1]
+
+
+def _load_cached_data() -> tuple[tuple, pd.DataFrame]:
+    """
+    Возвращает полный набор данных из общего кэша, перечитывая его при изменении
+    
+    Returns:
+        tuple[tuple, pd.DataFrame]: Отпечаток файлов и соответствующий ему DataFrame
+    """
+    global _data_cache
+    
+    _ensure_migrated()
+    fingerprint = _current_fingerprint()
+    cached = _data_cache
+    if cached is not None and cached[0] == fingerprint:
+        return cached
+    
+    with _cache_lock:
+        # Данные мог уже загрузить другой поток, пока мы ждали блокировку
+        cached = _data_cache
+        if cached is not None and cached[0] == fingerprint:
+            return cached
+        fingerprint = refresh_state("data")
+        while True:
+            df = _read_data()
+            # Файлы могли смениться посреди чтения (например, при сжатии журнала):
+            # тогда снимок и журнал несогласованы, и чтение повторяется
+            current = refresh_state("data")
+            if current == fingerprint:
+                break
+            fingerprint = current
+        _data_cache = (fingerprint, df)
+        return _data_cache
+
+
+def _read_data(columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Читает набор данных с диска: снимок и записи журнала
+    
+    Args:
+        columns: Колонки для чтения (None — все)
+        
+    Returns:
+        pd.DataFrame: DataFrame с данными или пустой DataFrame с нужными колонками
+    """
+    if STORAGE_MODE == "sqlite":
+        df = _read_sqlite(columns)
+    else:
+        df = _read_snapshot(columns)
+        
+        journal = _read_journals()
+        if journal:
+            journal_df = pd.DataFrame.from_records(journal)
+            if columns is not None:
+                journal_df = journal_df.reindex(columns=columns)
+            if df.empty:
+                df = journal_df
+            else:
+                df = pd.concat([df, journal_df], ignore_index=True)
+    
+    # Убеждаемся, что все необходимые колонки присутствуют и имеют типы схемы
+    df = apply_schema(df)
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+def _ensure_writer() -> None:
+    """Запускает поток записи, если он еще не запущен"""
+    global _writer_thread
+    
+    with _writer_start_lock:
+        if _writer_thread is not None and _writer_thread.is_alive():
+            return
+        _writer_thread = threading.Thread(
+            target=_writer_loop,
+            name="data-writer",
+            daemon=True
+        )
+        _writer_thread.start()
+
+
+def _submit_write(kind: str, payload) -> Future:
+    """
+    Ставит операцию записи в очередь единственного потока записи
+    
+    Args:
+        kind: "append" — дописать строки в журнал (payload — текст строк
+            и записи с типами схемы), "call" — выполнить функцию payload
+        payload: Данные операции
+        
+    Returns:
+        Future: Результат операции
+    """
+    _ensure_writer()
+    future = Future()
+    _write_queue.put((kind, payload, future))
+    return future
+
+
+def _finish_writes() -> None:
+    """
+    Дожидается выполнения поставленных операций записи при завершении процесса
+    
+    Поток записи фоновый и останавливается вместе с интерпретатором: без
+    ожидания прерывалось бы сжатие журнала, поставленное после сохранения,
+    и его записи оказывались бы в данных или архиве дважды.
+    """
+    while _writer_thread is not None and _writer_thread.is_alive():
+        _submit_write("call", lambda: None).result()
+        # Пока выполнялись операции, в очередь могло попасть сжатие журнала
+        if _write_queue.empty():
+            return
+
+
+atexit.register(_finish_writes)
+
+
+def _writer_loop() -> None:
+    """
+    Выполняет операции записи из очереди по одной пачке за раз
+    
+    На время пачки захватывается межпроцессная блокировка DATA_LOCK_FILE:
+    другие процессы приложения не пишут в файлы данных одновременно с этим.
+    """
+    while True:
+        jobs = [_write_queue.get()]
+        while True:
+            try:
+                jobs.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with file_lock(DATA_LOCK_FILE):
+                _run_write_jobs(jobs)
+        except Exception as error:
+            # Блокировку не удалось захватить: операции завершаются ошибкой
+            for _, _, future in jobs:
+                if not future.done():
+                    future.set_exception(error)
+
+
+def _run_write_jobs(jobs: list[tuple]) -> None:
+    """
+    Выполняет пачку операций записи в порядке поступления
+    
+    Подряд идущие дописывания в журнал объединяются в одну запись в файл,
+    поэтому при одновременных сохранениях пропускная способность не падает.
+    
+    Args:
+        jobs: Операции вида (kind, payload, future)
+    """
+    appends = []
+    for kind, payload, future in jobs:
+        if kind == "append":
+            appends.append((payload, future))
+            continue
+        _flush_appends(appends)
+        appends = []
+        try:
+            future.set_result(payload())
+        except Exception as error:
+            future.set_exception(error)
+    _flush_appends(appends)
+
+
+def _flush_appends(appends: list[tuple]) -> None:
+    """
+    Дописывает в журнал строки нескольких операций одной записью
+    
+    Args:
+        appends: Операции вида ((текст строк, записи), future)
+    """
+    global _journal_rows, _compaction_pending
+    
+    if not appends:
+        return
+    
+    text = "".join(lines for (lines, _), _ in appends)
+    records = [record for (_, batch), _ in appends for record in batch]
+    try:
+        if _journal_rows is None:
+            _journal_rows = len(_read_journal())
+        before = _data_fingerprint()
+        with open(JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write(text)
+        _journal_rows += text.count("\n")
+        _invalidate_cache()
+        _update_indexes_after_write(records, before)
+    except Exception as error:
+        for _, future in appends:
+            future.set_exception(error)
+        return
+    
+    for _, future in appends:
+        future.set_result(None)
+    
+    if _journal_rows >= JOURNAL_COMPACT_THRESHOLD and not _compaction_pending:
+        # Сжатие выполнит тот же поток записи после уже поставленных операций
+        _compaction_pending = True
+        future = Future()
+        future.add_done_callback(_log_compaction_error)
+        _write_queue.put(("call", _compact_journal_now, future))
+
+
+def _log_compaction_error(future: Future) -> None:
+    """
+    Записывает в журнал ошибку фонового сжатия журнала
+    
+    Следующее сохранение поставит сжатие в очередь снова.
+    
+    Args:
+        future: Результат операции сжатия
+    """
+    error = future.exception()
+    if error is not None:
+        logger.error("Не удалось сжать журнал отчетов", exc_info=error)
+
+
+@profiled
+def save_data(df: pd.DataFrame) -> None:
+    """
+    Сохраняет DataFrame в хранилище целиком (CSV файл или базу SQLite)
+    
+    Args:
+        df: DataFrame для сохранения (длинные тексты переносятся в хранилище текстов)
+    """
+    _ensure_migrated()
+    df = _store_texts(df)
+    _submit_write("call", lambda: _replace_data(df)).result()
+
+
+def _replace_data(df: pd.DataFrame) -> None:
+    """
+    Заменяет данные хранилища (выполняется в потоке записи)
+    
+    Args:
+        df: DataFrame для сохранения
+    """
+    global _journal_rows
+    
+    if STORAGE_MODE == "sqlite":
+        with _sqlite_connection() as conn:
+            # Таблица создается заново: набор колонок мог измениться при миграции
+            conn.execute("DROP TABLE IF EXISTS reports")
+            _create_sqlite_schema(conn)
+            _insert_sqlite(conn, df)
+        _invalidate_cache()
+        return
+    _write_snapshot(df)
+    for path in (JOURNAL_FILE, JOURNAL_COMPACTING_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+    _journal_rows = 0
+    _invalidate_cache()
+
+
+@profiled
+def append_report(new_row: pd.DataFrame) -> None:
+    """
+    Добавляет отчет в хранилище
+    
+    Все записи выполняются единственным потоком записи по очереди, поэтому
+    одновременные сохранения не теряют отчеты. В режимах "journal", "parquet"
+    и "sqlite" стоимость сохранения не зависит от объема истории: строки
+    дописываются в журнал или вставляются в базу. В режиме "csv" файл данных
+    перезаписывается.
+    
+    Args:
+        new_row: DataFrame с добавляемыми строками (см. create_data_row)
+        
+    Raises:
+        ValueError: Если месяц отчета не в формате YYYY-MM
+    """
+    # Страница ввода не загружает данные, поэтому после обновления приложения
+    # первое сохранение может опередить миграцию: она выполняется до записи
+    _ensure_migrated()
+    months = parse_months(new_row["Месяц"])
+    if months.isna().any():
+        invalid = new_row["Месяц"][months.isna()].iloc[0]
+        raise ValueError(f"Месяц '{invalid}' должен быть в формате YYYY-MM")
+    new_row = new_row.assign(Месяц=months.dt.strftime("%Y-%m"))
+    stored = _store_texts(new_row)
+    
+    if STORAGE_MODE == "sqlite":
+        _submit_write("call", lambda: _insert_report(stored)).result()
+    elif not _uses_journal():
+        _submit_write("call", lambda: _rewrite_with_report(stored)).result()
+    else:
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in _serialize_rows(stored)
+        )
+        _submit_write("append", (lines, _typed_records(stored))).result()
+
+
+def _rewrite_with_report(new_row: pd.DataFrame) -> None:
+    """
+    Перезаписывает CSV файл данных с добавленным отчетом (выполняется в потоке записи)
+    
+    Args:
+        new_row: DataFrame с добавляемыми строками
+    """
+    before = _data_fingerprint()
+    df = apply_schema(pd.concat([load_data(), new_row], ignore_index=True))
+    live, _ = _archive_superseded(df)
+    _replace_data(live)
+    _update_indexes_after_write(_typed_records(new_row), before)
+
+
+def _insert_report(new_row: pd.DataFrame) -> None:
+    """
+    Вставляет строки отчета в базу SQLite (выполняется в потоке записи)
+    
+    Args:
+        new_row: DataFrame с добавляемыми строками
+    """
+    before = _data_fingerprint()
+    keys = list(zip(new_row["Направление"], new_row["Месяц"]))
+    with _sqlite_connection() as conn:
+        _insert_sqlite(conn, new_row)
+        _move_superseded_sqlite(conn, keys)
+    _invalidate_cache()
+    _update_indexes_after_write(_typed_records(new_row), before)
+
+
+def compact_journal() -> None:
+    """
+    Сжимает журнал: переносит его записи в файл снимка данных и очищает журнал
+    
+    Вытесненные версии отчетов при этом переносятся в архив (см. compact_history).
+    """
+    _ensure_migrated()
+    _submit_write("call", _compact_journal_now).result()
+
+
+def _compact_journal_now() -> None:
+    """Сжимает журнал (выполняется в потоке записи)"""
+    global _journal_rows, _data_cache, _compaction_pending
+    
+    _compaction_pending = False
+    before = _data_fingerprint()
+    # Журнал откладывается в сторону: в снимок переносятся ровно его записи.
+    # Отложенный журнал остается от прерванного сжатия — тогда переносятся оба
+    renamed = False
+    if not os.path.exists(JOURNAL_COMPACTING_FILE):
+        if not os.path.exists(JOURNAL_FILE):
+            _journal_rows = 0
+            return
+        os.replace(JOURNAL_FILE, JOURNAL_COMPACTING_FILE)
+        renamed = True
+    df, _ = _archive_superseded(load_data())
+    _write_snapshot(df)
+    os.remove(JOURNAL_COMPACTING_FILE)
+    if not renamed and os.path.exists(JOURNAL_FILE):
+        os.remove(JOURNAL_FILE)
+    _journal_rows = 0
+    # Последние отчеты не изменились — кэш и представления остаются действительными
+    _data_cache = (refresh_state("data"), df)
+    _update_indexes_after_write([], before)
+
+
+@profiled
+def compact_history() -> int:
+    """
+    Оставляет в рабочих данных только последний отчет по каждой паре
+    (направление, месяц), а вытесненные версии переносит в сжатый архив
+    
+    В режимах "csv" и "sqlite" это происходит при каждом сохранении, в режимах
+    "journal" и "parquet" — при сжатии журнала; функция нужна для разового
+    сжатия уже накопленной истории.
+    
+    Returns:
+        int: Число перенесенных в архив версий
+    """
+    _ensure_migrated()
+    return _submit_write("call", _compact_history_now).result()
+
+
+def _compact_history_now() -> int:
+    """Переносит вытесненные версии отчетов в архив (выполняется в потоке записи)"""
+    before = _data_fingerprint()
+    if STORAGE_MODE == "sqlite":
+        with _sqlite_connection() as conn:
+            moved = _move_superseded_sqlite(conn)
+        _invalidate_cache()
+    else:
+        live, moved = _archive_superseded(load_data())
+        if moved:
+            _replace_data(live)
+    _update_indexes_after_write([], before)
+    return moved
+
+
+def _archive_superseded(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Переносит в архив строки, для которых есть более поздний отчет за тот же месяц
+    
+    Args:
+        df: Набор данных с типами схемы в порядке добавления
+        
+    Returns:
+        tuple[pd.DataFrame, int]: Оставшиеся строки и число перенесенных
+    """
+    keys = ["Направление", "Месяц"]
+    superseded = df.duplicated(subset=keys, keep="last") & df[keys].notna().all(axis=1)
+    if not superseded.any():
+        return df, 0
+    _archive_revisions(df[superseded])
+    return df[~superseded].reset_index(drop=True), int(superseded.sum())
+
+
+def _move_superseded_sqlite(conn: sqlite3.Connection, keys: list[tuple] | None = None) -> int:
+    """
+    Переносит вытесненные версии отчетов из базы SQLite в архив
+    
+    Args:
+        conn: Соединение с базой (удаление фиксируется вместе с его транзакцией)
+        keys: Пары (направление, месяц), которые нужно проверить (None — все)
+        
+    Returns:
+        int: Число перенесенных версий
+    """
+    columns_sql = ", ".join(f"r.{_quote(c)}" for c in DATA_COLUMNS)
+    query = (
+        f"SELECT r.id, {columns_sql} FROM reports AS r "
+        'WHERE EXISTS (SELECT 1 FROM reports AS n WHERE n."Направление" = r."Направление" '
+        'AND n."Месяц" = r."Месяц" AND n.id > r.id)'
+    )
+    params = []
+    # Для большого числа пар проще проверить всю таблицу по индексу
+    if keys is not None and len(keys) <= 500:
+        query += ' AND (r."Направление", r."Месяц") IN (VALUES ' + ", ".join("(?, ?)" for _ in keys) + ")"
+        params = [str(value) for key in keys for value in key]
+    superseded = pd.read_sql_query(query + " ORDER BY r.id", conn, params=params)
+    if superseded.empty:
+        return 0
+    
+    _archive_revisions(superseded.drop(columns="id"))
+    conn.executemany("DELETE FROM reports WHERE id = ?", [(int(i),) for i in superseded["id"]])
+    return len(superseded)
+
+
+def _archive_revisions(df: pd.DataFrame) -> None:
+    """
+    Дописывает версии отчетов в сжатый архив
+    
+    Каждая порция сжимается отдельным блоком gzip с заголовком CSV и дописывается
+    в конец архива на месте: стоимость не зависит от размера архива. Блоки
+    читаются по отдельности, поэтому набор колонок может меняться от блока
+    к блоку (например, при изменении METRICS). Блок, который дописывается прямо
+    сейчас или оборван сбоем, читатели пропускают (см. _read_archive).
+    
+    Args:
+        df: Строки для переноса в архив
+    """
+    size = os.path.getsize(ARCHIVE_FILE) if os.path.exists(ARCHIVE_FILE) else 0
+    rows = df.reindex(columns=DATA_COLUMNS).assign(
+        **{ARCHIVED_AT_COLUMN: pd.Timestamp.now().isoformat(timespec="seconds")}
+    )
+    data = gzip.compress(rows.to_csv(index=False).encode("utf-8"))
+    
+    with open(ARCHIVE_FILE, 'ab') as f:
+        try:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except Exception:
+            # Недописанный блок отрезается, чтобы следующие блоки читались
+            f.truncate(size)
+            raise
+
+
+def _archive_blocks(data: bytes) -> list[str]:
+    """
+    Распаковывает блоки gzip архива, пропуская недописанные и оборванные блоки
+    
+    Args:
+        data: Содержимое файла архива
+        
+    Returns:
+        list[str]: CSV тексты полных блоков по порядку
+    """
+    chunks = []
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            chunk = decompressor.decompress(data)
+            complete = decompressor.eof
+        except zlib.error:
+            complete = False
+        if complete:
+            chunks.append(chunk.decode("utf-8"))
+            data = decompressor.unused_data
+            continue
+        # Блок оборван сбоем записи: чтение продолжается со следующего блока
+        start = data.find(GZIP_MAGIC, 1)
+        if start < 0:
+            break
+        data = data[start:]
+    return chunks
+
+
+@profiled(reads_file=True)
+def _read_archive() -> pd.DataFrame:
+    """
+    Читает архив вытесненных версий отчетов
+    
+    Блоки разбираются по отдельности и объединяются по именам колонок.
+    
+    Returns:
+        pd.DataFrame: Строки архива без приведения типов
+    """
+    columns = DATA_COLUMNS + [ARCHIVED_AT_COLUMN]
+    if not os.path.exists(ARCHIVE_FILE):
+        return pd.DataFrame(columns=columns)
+    with open(ARCHIVE_FILE, 'rb') as f:
+        blocks = _archive_blocks(f.read())
+    
+    frames = []
+    header = columns
+    for text in blocks:
+        if text.startswith(DATA_COLUMNS[0] + ","):
+            frame = pd.read_csv(io.StringIO(text), dtype=object)
+            header = list(frame.columns)
+        elif text:
+            # Блоки ранних версий без заголовка: колонки предыдущего блока
+            frame = pd.read_csv(io.StringIO(text), dtype=object, header=None, names=header)
+        else:
+            continue
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    archive = pd.concat(frames, ignore_index=True)
+    extra = [col for col in archive.columns if col not in columns]
+    return archive.reindex(columns=columns + extra)
+
+
+@profiled
+def get_archived_revisions(direction: str | None = None,
+                           month: pd.Period | str | None = None) -> pd.DataFrame:
+    """
+    Возвращает вытесненные версии отчетов из архива
+    
+    Архив читается при каждом вызове и не занимает память между ними.
+    
+    Args:
+        direction: Название направления (None — все направления)
+        month: Месяц (None — все месяцы)
+        
+    Returns:
+        pd.DataFrame: Версии отчетов в порядке переноса с колонкой ARCHIVED_AT_COLUMN
+    """
+    archive = apply_schema(_read_archive())
+    mask = pd.Series(True, index=archive.index)
+    if direction is not None:
+        mask &= archive["Направление"] == direction
+    if month is not None:
+        mask &= archive["Месяц"] == pd.Period(month, "M")
+    return archive[mask].reset_index(drop=True)
+
+
+def _quote(name: str) -> str:
+    """Экранирует имя колонки для SQL запроса"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+@contextmanager
+def _sqlite_connection():
+    """
+    Открывает соединение с базой SQLite и создает схему при первом обращении
+    
+    Изменения фиксируются при успешном выходе из блока и откатываются при ошибке.
+    
+    Yields:
+        sqlite3.Connection: Соединение с базой
+    """
+    global _sqlite_ready
+    
+    conn = sqlite3.connect(SQLITE_FILE, timeout=30)
+    try:
+        if not _sqlite_ready:
+            # WAL позволяет читать базу во время записи
+            conn.execute("PRAGMA journal_mode=WAL")
+            _create_sqlite_schema(conn)
+            conn.commit()
+            _sqlite_ready = True
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _create_sqlite_schema(conn: sqlite3.Connection) -> None:
+    """
+    Создает таблицу отчетов и индекс по направлению и месяцу, если их нет
+    
+    Args:
+        conn: Соединение с базой
+    """
+    column_types = {TEXT_REF_COLUMN: "INTEGER", **{col: "REAL" for col in NUMERIC_COLUMNS}}
+    columns_sql = ", ".join(
+        f"{_quote(col)} {column_types.get(col, 'TEXT')}"
+        for col in DATA_COLUMNS
+    )
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS reports "
+        f"(id INTEGER PRIMARY KEY AUTOINCREMENT, {columns_sql})"
+    )
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_reports_direction_month '
+        'ON reports ("Направление", "Месяц")'
+    )
+
+
+def _insert_sqlite(conn: sqlite3.Connection, df: pd.DataFrame) -> None:
+    """
+    Вставляет строки DataFrame в таблицу отчетов
+    
+    Args:
+        conn: Соединение с базой
+        df: DataFrame со строками для вставки
+    """
+    placeholders = ", ".join("?" for _ in DATA_COLUMNS)
+    conn.executemany(
+        f"INSERT INTO reports ({', '.join(_quote(c) for c in DATA_COLUMNS)}) "
+        f"VALUES ({placeholders})",
+        [tuple(record.values()) for record in _serialize_rows(df)]
+    )
+
+
+@profiled(reads_file=True)
+def _query_sqlite(
+    where: str = "",
+    params: tuple = (),
+    columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Выбирает строки из таблицы отчетов в порядке добавления
+    
+    Args:
+        where: Условие WHERE без ключевого слова
+        params: Параметры условия
+        columns: Колонки для выборки (None — все)
+        
+    Returns:
+        pd.DataFrame: DataFrame с выбранными строками
+    """
+    columns_sql = ", ".join(_quote(c) for c in (columns or DATA_COLUMNS))
+    query = f"SELECT {columns_sql} FROM reports"
+    if where:
+        query += f" WHERE {where}"
+    query += " ORDER BY id"
+    with _sqlite_connection() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+def _read_sqlite(columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Читает весь набор данных из базы SQLite
+    
+    Args:
+        columns: Колонки для чтения (None — все)
+        
+    Returns:
+        pd.DataFrame: DataFrame с данными
+    """
+    return _query_sqlite(columns=columns)
+
+
+@profiled
+def _build_latest_index(df: pd.DataFrame) -> dict:
+    """
+    Строит представление последних отчетов по (направлению, месяцу)
+    
+    Args:
+        df: Полный набор данных
+        
+    Returns:
+        dict: {"reports": {(направление, месяц): запись},
+            "months": {направление: [месяцы по возрастанию]},
+            "category_months": {категория: [месяцы по возрастанию]},
+            "direction_rollups" и "category_rollups": агрегаты (см. _apply_rollup),
+            "versions": {категория или None для всех: число изменений},
+            "log": [записи, еще не прочитанные всеми читателями изменений, по порядку],
+            "log_start": номер первой записи log среди добавленных после построения,
+            "readers": {читатель: номер следующей непрочитанной записи}
+                (см. get_report_changes),
+            "undated": число строк с нераспознанным месяцем,
+            "generation": номер построения}
+    """
+    keys = ["Направление", "Месяц"]
+    valid = df.dropna(subset=keys)
+    
+    index = {
+        "reports": {},
+        "months": {},
+        "category_months": {},
+        "direction_rollups": {},
+        "category_rollups": {},
+        "versions": {},
+        "log": [],
+        "log_start": 0,
+        "readers": {},
+        "undated": int(df["Месяц"].isna().sum()),
+        "generation": next(_index_generations)
+    }
+    latest = valid.drop_duplicates(subset=keys, keep="last").sort_values("Месяц")
+    for record in latest.to_dict("records"):
+        _add_index_key(index, record["Направление"], record["Месяц"])
+        index["reports"][(record["Направление"], record["Месяц"])] = record
+        _apply_rollup(index, record, 1)
+    return index
+
+
+def _apply_rollup(index: dict, record: dict, sign: int) -> None:
+    """
+    Добавляет (sign=1) или вычитает (sign=-1) вклад отчета в месячные агрегаты
+    
+    Агрегаты хранятся как {название: {месяц: {метрика: [сумма, количество]}}},
+    где название — направление или категория.
+    
+    Args:
+        index: Представление последних отчетов
+        record: Запись отчета
+        sign: Знак вклада
+    """
+    direction, month = record["Направление"], record["Месяц"]
+    targets = [index["direction_rollups"].setdefault(direction, {}).setdefault(month, {})]
+    category_label = DIRECTION_CATEGORIES.get(direction)
+    if category_label is not None:
+        targets.append(
+            index["category_rollups"].setdefault(category_label, {}).setdefault(month, {})
+        )
+    
+    for metric in NUMERIC_METRICS:
+        value = record.get(metric)
+        if value is None or pd.isna(value):
+            continue
+        for rollup in targets:
+            totals = rollup.setdefault(metric, [0.0, 0])
+            totals[0] += sign * float(value)
+            totals[1] += sign
+
+
+def _add_index_key(index: dict, direction: str, month: pd.Period) -> None:
+    """
+    Добавляет месяц в отсортированные списки месяцев направления и его категории
+    
+    Args:
+        index: Представление последних отчетов
+        direction: Название направления
+        month: Месяц отчета
+    """
+    if (direction, month) in index["reports"]:
+        return
+    insort(index["months"].setdefault(direction, []), month)
+    
+    category_label = DIRECTION_CATEGORIES.get(direction)
+    if category_label is not None:
+        category_months = index["category_months"].setdefault(category_label, [])
+        position = bisect_left(category_months, month)
+        if position == len(category_months) or category_months[position] != month:
+            category_months.insert(position, month)
+
+
+def _month_slice(months: list[pd.Period], start: pd.Period | str | None,
+                 end: pd.Period | str | None) -> list[pd.Period]:
+    """
+    Выбирает из отсортированного списка месяцы диапазона двоичным поиском
+    
+    Args:
+        months: Месяцы по возрастанию
+        start: Первый месяц диапазона включительно (None — без ограничения)
+        end: Последний месяц диапазона включительно (None — без ограничения)
+        
+    Returns:
+        list[pd.Period]: Месяцы диапазона по возрастанию
+    """
+    low = 0 if start is None else bisect_left(months, pd.Period(start, "M"))
+    high = len(months) if end is None else bisect_right(months, pd.Period(end, "M"))
+    return months[low:high]
+
+
+def _add_to_latest_index(index: dict, records: list[dict]) -> None:
+    """
+    Обновляет представление последних отчетов новыми записями
+    
+    Args:
+        index: Представление (см. _build_latest_index)
+        records: Записи с типами схемы в порядке добавления
+    """
+    if not records:
+        return
+    # Сводная карта строится заново при следующем обращении
+    index.pop("overview", None)
+    for record in records:
+        direction, month = record["Направление"], record["Месяц"]
+        if pd.isna(direction) or pd.isna(month):
+            continue
+        _bump_versions(index, direction)
+        _log_change(index, record)
+        _add_index_key(index, direction, month)
+        # Повторный отчет за месяц заменяет вклад предыдущего в агрегаты
+        previous = index["reports"].get((direction, month))
+        if previous is not None:
+            _apply_rollup(index, previous, -1)
+        index["reports"][(direction, month)] = record
+        _apply_rollup(index, record, 1)
+
+
+def _bump_versions(index: dict, direction: str) -> None:
+    """
+    Отмечает изменение отчетов направления в версиях представления
+    
+    Args:
+        index: Представление последних отчетов
+        direction: Название направления
+    """
+    versions = index["versions"]
+    versions[None] = versions.get(None, 0) + 1
+    category_label = DIRECTION_CATEGORIES.get(direction)
+    if category_label is not None:
+        versions[category_label] = versions.get(category_label, 0) + 1
+
+
+def _get_latest_index() -> dict:
+    """
+    Возвращает актуальное представление последних отчетов
+    
+    Сохранения этого процесса применяются к представлению на месте, строки,
+    добавленные другими процессами, дочитываются с последней прочитанной
+    позиции. Целиком представление перестраивается только после перезаписи
+    данных (режим "csv", сжатие журнала, импорт).
+    
+    Returns:
+        dict: Представление (см. _build_latest_index)
+    """
+    global _latest_index
+    
+    _ensure_migrated()
+    with _index_lock:
+        fingerprint = _current_fingerprint()
+        index = _latest_index
+        if index is not None and index["fingerprint"] == fingerprint:
+            return index
+        
+        new_rows = _read_new_rows(index["position"]) if index is not None else None
+        if new_rows is not None:
+            records, index["position"] = new_rows
+            _add_to_latest_index(index, records)
+            index["fingerprint"] = fingerprint
+            return index
+        
+        # Позиция берется до чтения: строки, добавленные между ними,
+        # будут дочитаны повторно, что не меняет представление
+        position = _read_position()
+        refresh_state("data")
+        fingerprint, df = _load_cached_data()
+        index = _build_latest_index(df)
+        index["fingerprint"] = fingerprint
+        index["position"] = position
+        _latest_index = index
+        return index
+
+
+def _update_indexes_after_write(records: list[dict], before: tuple) -> None:
+    """
+    Применяет записанные этим процессом строки к представлениям в памяти
+    
+    Если до записи представление уже было устаревшим, оно не трогается
+    и будет перестроено при следующем чтении.
+    
+    Args:
+        records: Записи с типами схемы
+        before: Отпечаток данных до записи
+    """
+    with _index_lock:
+        index = _latest_index
+        if index is None or index["fingerprint"] != before:
+            return
+        _add_to_latest_index(index, records)
+        index["fingerprint"] = _data_fingerprint()
+        index["position"] = _read_position()
+
+
+def _typed_records(df: pd.DataFrame) -> list[dict]:
+    """
+    Преобразует строки DataFrame в записи с типами схемы
+    
+    Args:
+        df: DataFrame со строками
+        
+    Returns:
+        list[dict]: Записи вида {колонка: значение}
+    """
+    return apply_schema(df)[DATA_COLUMNS].to_dict("records")
+
+
+@profiled
+def get_reports_version(category_label: str | None = None) -> tuple:
+    """
+    Возвращает версию отчетов категории для проверки появления новых
+    
+    Версия меняется при каждом добавлении отчета по направлению категории
+    (в том числе другим процессом). Если файлы данных не менялись, проверка
+    не обращается к диску.
+    
+    Args:
+        category_label: Название категории (None — все категории)
+        
+    Returns:
+        tuple: Непрозрачная версия, сравниваемая на равенство
+    """
+    index = _get_latest_index()
+    return (index["generation"], index["versions"].get(category_label, 0))
+
+
+def _log_change(index: dict, record: dict) -> None:
+    """
+    Запоминает добавленный отчет для читателей изменений (см. get_report_changes)
+    
+    Пока читателей нет, записи не хранятся: первый вызов читателя все равно
+    строит его индекс заново. Журнал изменений не длиннее REPORT_CHANGES_LIMIT
+    записей: отставший сильнее читатель строит индекс заново.
+    
+    Args:
+        index: Представление последних отчетов
+        record: Запись отчета
+    """
+    if not index["readers"]:
+        return
+    log = index["log"]
+    log.append(record)
+    if len(log) > REPORT_CHANGES_LIMIT:
+        excess = len(log) - REPORT_CHANGES_LIMIT
+        del log[:excess]
+        index["log_start"] += excess
+
+
+@profiled
+def get_report_changes(reader: str, cursor: tuple | None) -> tuple[list[dict] | None, tuple]:
+    """
+    Возвращает отчеты, добавленные после позиции cursor (в том числе другими процессами)
+    
+    Позволяет индексам в памяти (подсказки, поиск) дочитывать новые отчеты
+    вместо перестроения. После перезаписи данных (режим "csv", сжатие
+    журнала, импорт) прежние позиции недействительны, и индекс строится заново.
+    Записи, прочитанные всеми читателями, удаляются из памяти.
+    
+    Args:
+        reader: Имя читателя (индекса), например "search"
+        cursor: Позиция, возвращенная предыдущим вызовом этому читателю
+            (None — первый вызов)
+        
+    Returns:
+        tuple[list[dict] | None, tuple]: Записи с типами схемы в порядке добавления
+            (длинные тексты — ссылками, см. with_texts) или None, если индекс
+            нужно построить заново по load_data; и новая позиция
+    """
+    index = _get_latest_index()
+    with _index_lock:
+        log = index["log"]
+        end = index["log_start"] + len(log)
+        position = (index["generation"], end)
+        if cursor is None or cursor[0] != position[0] or cursor[1] < index["log_start"]:
+            records = None
+        else:
+            records = log[cursor[1] - index["log_start"]:]
+        
+        index["readers"][reader] = end
+        # Отставшие читатели (их записи уже отброшены) будут строить индекс заново
+        oldest = max(min(index["readers"].values()), index["log_start"])
+        del log[:oldest - index["log_start"]]
+        index["log_start"] = oldest
+    return records, position
+
+
+@profiled
+def has_reports() -> bool:
+    """
+    Проверяет, сохранен ли хотя бы один отчет
+    
+    Returns:
+        bool: True, если в хранилище есть отчеты
+    """
+    return bool(_get_latest_index()["reports"])
+
+
+@profiled
+def get_undated_reports() -> pd.DataFrame:
+    """
+    Возвращает отчеты, месяц которых не удалось распознать
+    
+    Такие отчеты (например, с месяцем, введенным свободным текстом в ранних
+    версиях приложения) не попадают ни в одно представление по месяцам:
+    их месяц нужно исправить в файле данных или импортом.
+    
+    Returns:
+        pd.DataFrame: Колонки "Направление" и "Месяц" (в том виде, в каком
+            месяц сохранен); пустой, если таких отчетов нет
+    """
+    if not _get_latest_index()["undated"]:
+        return pd.DataFrame(columns=["Направление", "Месяц"])
+    raw = _read_raw_data()
+    undated = parse_months(raw["Месяц"].astype(object)).isna()
+    return raw.loc[undated, ["Направление", "Месяц"]].reset_index(drop=True)
+
+
+@profiled
+def get_report_directions(directions: list[str]) -> list[str]:
+    """
+    Возвращает направления из списка, по которым есть отчеты
+    
+    Args:
+        directions: Список направлений (например, направления категории)
+        
+    Returns:
+        list[str]: Направления в порядке переданного списка
+    """
+    months = _get_latest_index()["months"]
+    return [direction for direction in directions if direction in months]
 
 
-def load_data() -> pd.DataFrame:
+@profiled
+def get_report_months(direction: str, start: pd.Period | str | None = None,
+                      end: pd.Period | str | None = None) -> list[pd.Period]:
     """
-    Загружает данные из CSV файла
+    Возвращает месяцы, за которые есть отчеты по направлению
     
+    Args:
+        direction: Название направления
+        start: Первый месяц диапазона включительно (None — с начала истории)
+        end: Последний месяц диапазона включительно (None — до конца истории)
+        
     Returns:
-        pd.DataFrame: DataFrame с данными или пустой DataFrame с нужными колонками
+        list[pd.Period]: Месяцы по возрастанию
+    """
+    return _month_slice(_get_latest_index()["months"].get(direction, []), start, end)
+
+
+@profiled
+def get_last_months(direction: str, count: int = 12,
+                    end: pd.Period | str | None = None) -> list[pd.Period]:
+    """
+    Возвращает месяцы с отчетами за последние count календарных месяцев
+    
+    Args:
+        direction: Название направления
+        count: Длина окна в месяцах
+        end: Последний месяц окна (None — последний месяц с отчетом)
+        
+    Returns:
+        list[pd.Period]: Месяцы окна по возрастанию
+    """
+    months = _get_latest_index()["months"].get(direction, [])
+    if not months:
+        return []
+    end = months[-1] if end is None else pd.Period(end, "M")
+    return _month_slice(months, end - (count - 1), end)
+
+
+@profiled
+def get_report(direction: str, month: pd.Period | str) -> pd.Series | None:
+    """
+    Возвращает последний сохраненный отчет по направлению за месяц
+    
+    Args:
+        direction: Название направления
+        month: Месяц (период или строка YYYY-MM)
+        
+    Returns:
+        pd.Series | None: Строка отчета или None, если отчета нет
+    """
+    if not isinstance(month, pd.Period):
+        month = pd.Period(month, "M")
+    record = _get_latest_index()["reports"].get((direction, month))
+    if record is None:
+        return None
+    return pd.Series(record)
+
+
+@profiled
+def get_latest_reports(direction: str, start: pd.Period | str | None = None,
+                       end: pd.Period | str | None = None) -> pd.DataFrame:
+    """
+    Возвращает последние отчеты по направлению, по одному на месяц
+    
+    Args:
+        direction: Название направления
+        start: Первый месяц диапазона включительно (None — с начала истории)
+        end: Последний месяц диапазона включительно (None — до конца истории)
+        
+    Returns:
+        pd.DataFrame: DataFrame с отчетами по возрастанию месяцев
+    """
+    index = _get_latest_index()
+    months = _month_slice(index["months"].get(direction, []), start, end)
+    records = [index["reports"][(direction, month)] for month in months]
+    return apply_schema(pd.DataFrame.from_records(records, columns=DATA_COLUMNS))
+
+
+@profiled
+def _build_overview(index: dict) -> dict:
+    """
+    Строит сводные таблицы направлений по месяцам за один проход
+    
+    Args:
+        index: Представление последних отчетов
+        
+    Returns:
+        dict: {метрика: DataFrame}, строки — направления в порядке CATEGORIES,
+            колонки — месяцы по возрастанию
     """
-    columns = (
-        ["Направление", "Месяц", "Стадия"] +
-        METRICS +
-        ["Общая цифра"] +
-        NUMERIC_METRICS +
-        [TEXT_METRIC] +
-        NEW_TEXT_FIELDS
+    columns = ["Направление", "Месяц"] + OVERVIEW_METRICS
+    frame = pd.DataFrame.from_records(list(index["reports"].values()), columns=columns)
+    # Направления вне CATEGORIES (из старых данных) идут в конце
+    directions = [d for d in DIRECTION_CATEGORIES if d in index["months"]] + sorted(
+        d for d in index["months"] if d not in DIRECTION_CATEGORIES
     )
     
-    if os.path.exists(DATA_FILE):
-        try:
-            df = pd.read_csv(DATA_FILE)
-            # Убеждаемся, что все необходимые колонки присутствуют
-            for col in columns:
-                if col not in df.columns:
-                    df[col] = None
-            return df
-        except pd.errors.EmptyDataError:
-            return pd.DataFrame(columns=columns)
+    if frame.empty:
+        empty = pd.DataFrame(
+            index=pd.Index([], name="Направление"),
+            columns=pd.PeriodIndex([], freq="M", name="Месяц"),
+            dtype="float64"
+        )
+        return {metric: empty for metric in OVERVIEW_METRICS}
+    
+    pivot = (
+        frame.astype({metric: "float64" for metric in OVERVIEW_METRICS})
+        .set_index(["Направление", "Месяц"])
+        .unstack("Месяц")
+    )
+    return {metric: pivot[metric].reindex(directions) for metric in OVERVIEW_METRICS}
+
+
+@profiled
+def get_overview(metric: str, start: pd.Period | str | None = None,
+                 end: pd.Period | str | None = None) -> pd.DataFrame:
+    """
+    Возвращает значения метрики по всем направлениям и месяцам
+    
+    Сводные таблицы для всех метрик OVERVIEW_METRICS строятся одним проходом
+    по последним отчетам и хранятся до следующего изменения данных. Таблица
+    общая для всех сессий, изменять ее нельзя.
+    
+    Args:
+        metric: Метрика из OVERVIEW_METRICS
+        start: Первый месяц диапазона включительно (None — с начала истории)
+        end: Последний месяц диапазона включительно (None — до конца истории)
+        
+    Returns:
+        pd.DataFrame: Строки — направления, колонки — месяцы по возрастанию,
+            NaN — нет отчета
+    """
+    index = _get_latest_index()
+    with _index_lock:
+        overview = index.get("overview")
+        if overview is None:
+            overview = index["overview"] = _build_overview(index)
+    
+    values = overview[metric]
+    if start is None and end is None:
+        return values
+    months = list(values.columns)
+    return values[_month_slice(months, start, end)]
+
+
+@profiled
+def get_direction_history(direction: str) -> pd.DataFrame:
+    """
+    Возвращает все отчеты по направлению, включая версии из архива
+    
+    Args:
+        direction: Название направления
+        
+    Returns:
+        pd.DataFrame: DataFrame с отчетами: сначала версии из архива,
+            затем рабочие данные, каждые в порядке добавления
+    """
+    if STORAGE_MODE == "sqlite":
+        live = _query_sqlite('"Направление" = ?', (direction,))
     else:
-        return pd.DataFrame(columns=columns)
+        df = load_data()
+        live = df[df["Направление"] == direction]
+    
+    archived = get_archived_revisions(direction).drop(columns=ARCHIVED_AT_COLUMN)
+    frames = [frame for frame in (archived, live) if not frame.empty]
+    if not frames:
+        return apply_schema(live.reset_index(drop=True))
+    return apply_schema(pd.concat(frames, ignore_index=True))
 
 
-def save_data(df: pd.DataFrame) -> None:
+@profiled
+def get_report_revisions(direction: str, month: pd.Period | str) -> pd.DataFrame:
     """
-    Сохраняет DataFrame в CSV файл
+    Возвращает предыдущие версии отчета по направлению за месяц
     
     Args:
-        df: DataFrame для сохранения
+        direction: Название направления
+        month: Месяц (период или строка YYYY-MM)
+        
+    Returns:
+        pd.DataFrame: Версии, вытесненные последним отчетом, в порядке добавления
+            (с длинными текстами)
+    """
+    history = get_direction_history(direction)
+    versions = history[history["Месяц"] == pd.Period(month, "M")]
+    return with_texts(versions.iloc[:-1].reset_index(drop=True))
+
+
+def _store_texts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Переносит длинные тексты строк в хранилище текстов и заменяет их ссылкой
+    
+    Для строк без длинных текстов запись в хранилище не создается, а уже
+    имеющаяся ссылка сохраняется.
+    
+    Args:
+        df: Строки отчетов (без колонок LONG_TEXT_FIELDS возвращаются как есть)
+        
+    Returns:
+        pd.DataFrame: Строки без колонок LONG_TEXT_FIELDS с колонкой TEXT_REF_COLUMN
+    """
+    present = [field for field in LONG_TEXT_FIELDS if field in df.columns]
+    if not present:
+        return df
+    
+    texts = df[present].map(
+        lambda value: str(value) if pd.notna(value) and str(value).strip() else None
+    )
+    has_text = texts.notna().any(axis=1)
+    if TEXT_REF_COLUMN in df.columns:
+        refs = pd.to_numeric(df[TEXT_REF_COLUMN], errors="coerce").astype("Int64")
+    else:
+        refs = pd.Series(pd.NA, index=df.index, dtype="Int64")
+    if has_text.any():
+        refs[has_text] = pd.array(store_texts(texts[has_text].to_dict("records")), dtype="Int64")
+    
+    return df.drop(columns=present).assign(**{TEXT_REF_COLUMN: refs})
+
+
+@profiled
+def get_report_texts(report: pd.Series) -> dict[str, str]:
+    """
+    Возвращает длинные тексты отчета из хранилища текстов
+    
+    Args:
+        report: Строка отчета (см. get_report)
+        
+    Returns:
+        dict[str, str]: {поле: текст} для заполненных полей LONG_TEXT_FIELDS
+    """
+    ref = report.get(TEXT_REF_COLUMN)
+    if ref is None or pd.isna(ref):
+        return {}
+    return get_texts([ref]).get(int(ref), {})
+
+
+def with_texts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Добавляет к строкам набора данных их длинные тексты
+    
+    Args:
+        df: Строки набора данных с колонкой TEXT_REF_COLUMN
+        
+    Returns:
+        pd.DataFrame: Строки в формате REPORT_COLUMNS (лишние колонки сохраняются)
+    """
+    refs = df[TEXT_REF_COLUMN] if TEXT_REF_COLUMN in df.columns else pd.Series(pd.NA, index=df.index)
+    texts = get_texts(refs.dropna().tolist())
+    records = [texts.get(int(ref), {}) if pd.notna(ref) else {} for ref in refs]
+    
+    df = df.drop(columns=TEXT_REF_COLUMN, errors="ignore")
+    for field in LONG_TEXT_FIELDS:
+        df[field] = pd.array([record.get(field) for record in records], dtype="string")
+    extra = [col for col in df.columns if col not in REPORT_COLUMNS]
+    return df[REPORT_COLUMNS + extra]
+
+
+def _rollup_frame(rollups: dict, months: list[pd.Period], metric: str) -> pd.DataFrame:
+    """
+    Собирает месячные агрегаты одного направления или категории в DataFrame
+    
+    Args:
+        rollups: Агрегаты направления или категории по месяцам
+        months: Месяцы по возрастанию
+        metric: Числовая метрика из NUMERIC_METRICS
+        
+    Returns:
+        pd.DataFrame: Колонки sum, count и mean, индекс — месяцы по возрастанию
+    """
+    totals = [rollups.get(month, {}).get(metric) for month in months]
+    months = [month for month, total in zip(months, totals) if total and total[1] > 0]
+    frame = pd.DataFrame(
+        [total for total in totals if total and total[1] > 0],
+        index=pd.PeriodIndex(months, freq="M", name="Месяц"),
+        columns=["sum", "count"]
+    ).astype({"sum": "float64", "count": "int64"})
+    frame["mean"] = frame["sum"] / frame["count"]
+    return frame
+
+
+@profiled
+def get_direction_rollup(direction: str, metric: str,
+                         start: pd.Period | str | None = None,
+                         end: pd.Period | str | None = None) -> pd.DataFrame:
+    """
+    Возвращает месячные агрегаты числовой метрики по направлению
+    
+    Агрегаты считаются по последним отчетам и обновляются при каждом сохранении.
+    
+    Args:
+        direction: Название направления
+        metric: Числовая метрика из NUMERIC_METRICS
+        start: Первый месяц диапазона включительно (None — с начала истории)
+        end: Последний месяц диапазона включительно (None — до конца истории)
+        
+    Returns:
+        pd.DataFrame: Колонки sum, count и mean, индекс — месяцы по возрастанию
+    """
+    index = _get_latest_index()
+    months = _month_slice(index["months"].get(direction, []), start, end)
+    return _rollup_frame(index["direction_rollups"].get(direction, {}), months, metric)
+
+
+@profiled
+def get_category_rollup(category_label: str, metric: str,
+                        start: pd.Period | str | None = None,
+                        end: pd.Period | str | None = None) -> pd.DataFrame:
+    """
+    Возвращает месячные агрегаты числовой метрики по всем направлениям категории
+    
+    Args:
+        category_label: Название категории
+        metric: Числовая метрика из NUMERIC_METRICS
+        start: Первый месяц диапазона включительно (None — с начала истории)
+        end: Последний месяц диапазона включительно (None — до конца истории)
+        
+    Returns:
+        pd.DataFrame: Колонки sum, count и mean, индекс — месяцы по возрастанию
+    """
+    index = _get_latest_index()
+    months = _month_slice(index["category_months"].get(category_label, []), start, end)
+    return _rollup_frame(index["category_rollups"].get(category_label, {}), months, metric)
+
+
+@profiled
+def read_reports_file(file, file_name: str) -> pd.DataFrame:
+    """
+    Читает файл с отчетами в формате колонок load_data
+    
+    Args:
+        file: Путь к файлу или файловый объект
+        file_name: Имя файла (по расширению выбирается формат CSV или XLSX)
+        
+    Returns:
+        pd.DataFrame: Прочитанные строки без приведения типов
+    """
+    if file_name.lower().endswith(".xlsx"):
+        return pd.read_excel(file, dtype=object)
+    return pd.read_csv(file, dtype=object)
+
+
+def validate_reports(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Проверяет строки отчетов для массового импорта
+    
+    Проверки выполняются над колонками целиком: направление из CATEGORIES,
+    стадия из STAGE_OPTIONS, месяц в формате YYYY-MM, оценки метрик от 0 до 10
+    и неотрицательные финансовые показатели.
+    
+    Args:
+        df: Строки отчетов в формате колонок load_data
+        
+    Returns:
+        pd.DataFrame: Колонки "Строка файла" и "Ошибки" для строк с ошибками
+        
+    Raises:
+        ValueError: Если в файле нет обязательных колонок
+    """
+    df = df.reset_index(drop=True)
+    required = ["Направление", "Месяц", "Стадия"] + METRICS
+    missing = [col for col in required if col not in df.columns]
+    if missing:
+        raise ValueError("В файле нет колонок: " + ", ".join(missing))
+    
+    checks = {
+        "неизвестное направление": ~df["Направление"].isin(list(DIRECTION_CATEGORIES)),
+        "неизвестная стадия": ~df["Стадия"].isin(STAGE_OPTIONS),
+        "месяц не в формате YYYY-MM": parse_months(df["Месяц"]).isna()
+    }
+    for metric in METRICS:
+        values = pd.to_numeric(df[metric], errors="coerce")
+        checks[f"{metric}: нужно число от 0 до 10"] = ~values.between(0, 10)
+    for metric in NUMERIC_METRICS:
+        if metric not in df.columns:
+            continue
+        values = pd.to_numeric(df[metric], errors="coerce")
+        checks[f"{metric}: нужно неотрицательное число"] = (
+            values.lt(0) | (df[metric].notna() & values.isna())
+        )
+    
+    failed = pd.DataFrame(checks, index=df.index)
+    failed = failed[failed.any(axis=1)]
+    messages = [
+        "; ".join(failed.columns[row])
+        for row in failed.to_numpy()
+    ]
+    # Строка 1 файла — заголовок
+    return pd.DataFrame({
+        "Строка файла": failed.index + 2,
+        "Ошибки": messages
+    })
+
+
+@profiled
+def import_reports(df: pd.DataFrame) -> tuple[int, pd.DataFrame]:
+    """
+    Импортирует отчеты одной записью в хранилище
+    
+    Строки с ошибками пропускаются, "Общая цифра" пересчитывается для всех
+    импортируемых строк сразу.
+    
+    Args:
+        df: Строки отчетов в формате колонок load_data
+        
+    Returns:
+        tuple[int, pd.DataFrame]: Число импортированных строк и отчет об ошибках
+            (см. validate_reports)
+    """
+    df = df.reset_index(drop=True)
+    errors = validate_reports(df)
+    valid = df.drop(index=errors["Строка файла"] - 2).reindex(columns=REPORT_COLUMNS)
+    if valid.empty:
+        return 0, errors
+    
+    valid["Месяц"] = parse_months(valid["Месяц"]).dt.strftime("%Y-%m")
+    for metric in NUMERIC_METRICS:
+        valid[metric] = pd.to_numeric(valid[metric], errors="coerce")
+    
+    append_report(recompute_derived(valid))
+    return len(valid), errors
+
+
+def import_csv(path: str) -> None:
+    """
+    Заменяет данные хранилища содержимым CSV файла
+    
+    Args:
+        path: Путь к CSV файлу в формате load_data
+    """
+    df = pd.read_csv(path)
+    save_data(df.reindex(columns=REPORT_COLUMNS))
+
+
+def convert_csv_to_parquet(
+    csv_path: str = DATA_FILE,
+    parquet_path: str = PARQUET_FILE
+) -> None:
+    """
+    Однократно конвертирует CSV файл данных в Parquet с типизированной схемой
+    
+    Записи журнала не затрагиваются и продолжают читаться в режиме "parquet".
+    
+    Args:
+        csv_path: Путь к исходному CSV файлу
+        parquet_path: Путь к создаваемому Parquet файлу
+    """
+    df = apply_schema(pd.read_csv(csv_path))
+    replace_file(parquet_path, lambda path: df.to_parquet(path, index=False))
+
+
+def export_csv(path: str) -> None:
+    """
+    Выгружает все данные хранилища в CSV файл вместе с длинными текстами
+    
+    Args:
+        path: Путь к создаваемому CSV файлу
+    """
+    with_texts(load_data()).to_csv(path, index=False)
+
+
+def recompute_derived(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Пересчитывает производные колонки (DERIVED_COLUMNS) для всех строк сразу
+    
+    Args:
+        df: DataFrame с колонками METRICS
+        
+    Returns:
+        pd.DataFrame: Копия DataFrame с пересчитанными производными колонками
     """
-    df.to_csv(DATA_FILE, index=False)
+    df = df.copy()
+    for col in METRICS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    for col, rule in DERIVED_COLUMNS.items():
+        df[col] = rule(df)
+    return df
 
 
-def calculate_overall_score(metrics_values: list[float]) -> float:
+def migrate_data(df: pd.DataFrame, from_version: int) -> pd.DataFrame:
     """
-    Вычисляет общую оценку как среднее арифметическое метрик
+    Приводит данные, сохраненные со старой версией схемы, к текущей
     
     Args:
-        metrics_values: Список значений метрик
+        df: Данные в том виде, в каком они прочитаны с диска
+        from_version: Версия схемы, с которой данные были сохранены
+            (1 — файлы, созданные до появления версии схемы)
         
     Returns:
-        float: Среднее значение метрик, округленное до 2 знаков
+        pd.DataFrame: Данные в текущей схеме с пересчитанными производными колонками
+            (длинные тексты переносятся в хранилище текстов)
+    """
+    # Части колонок могло не быть (версия 1 или изменившийся набор метрик METRICS):
+    # недостающие добавляются пустыми, лишние сохраняются
+    extra = [col for col in df.columns if col not in DATA_COLUMNS]
+    df = df.reindex(columns=DATA_COLUMNS + extra)
+    if from_version < 2:
+        # Версия 1: месяц вводился свободным текстом.
+        # Распознанные месяцы приводятся к YYYY-MM, остальные сохраняются как есть
+        months = df["Месяц"].astype(object)
+        parsed = parse_months(months).dt.strftime("%Y-%m")
+        df["Месяц"] = parsed.astype(object).where(parsed.notna(), months)
+    if from_version < 3:
+        # Версия 2: длинные тексты хранились в наборе данных
+        df = _store_texts(df)
+    # Нечисловые значения числовых колонок (исправленные вручную) становятся пропусками
+    for col in NUMERIC_METRICS + [TEXT_REF_COLUMN]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return recompute_derived(df)
+
+
+@profiled(reads_file=True)
+def _read_meta() -> dict:
+    """
+    Читает сведения о схеме сохраненных данных
+    
+    Returns:
+        dict: {"schema_version": int, "metrics": list[str]}; для данных без
+            файла сведений — версия 1
+    """
+    try:
+        with open(DATA_META_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {"schema_version": 1, "metrics": None}
+
+
+def _write_meta() -> None:
+    """Записывает сведения о текущей схеме данных"""
+    meta = {"schema_version": SCHEMA_VERSION, "metrics": METRICS}
+    
+    def write(path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    
+    replace_file(DATA_META_FILE, write)
+
+
+def _meta_is_current(meta: dict) -> bool:
+    """Проверяет, сохранены ли данные с текущей схемой и набором метрик"""
+    return meta.get("schema_version") == SCHEMA_VERSION and meta.get("metrics") == METRICS
+
+
+def _ensure_migrated() -> None:
+    """
+    Однократно за процесс проверяет версию схемы и при необходимости мигрирует данные
+    
+    Миграция выполняется потоком записи: данные читаются, приводятся
+    к текущей схеме, производные колонки пересчитываются, и результат
+    записывается один раз. Дальнейшие загрузки читают уже мигрированные данные.
+    """
+    global _schema_checked
+    
+    if _schema_checked:
+        return
+    if not _meta_is_current(_read_meta()):
+        if threading.current_thread() is _writer_thread:
+            _migrate_now()
+        else:
+            _submit_write("call", _migrate_now).result()
+    _schema_checked = True
+
+
+def _migrate_now() -> None:
+    """Мигрирует сохраненные данные к текущей схеме (выполняется в потоке записи)"""
+    meta = _read_meta()
+    if _meta_is_current(meta):
+        return
+    
+    has_data = any(fingerprint is not None for fingerprint in _data_fingerprint())
+    if has_data:
+        df = _read_raw_data()
+        if not df.empty:
+            _replace_data(migrate_data(df, meta.get("schema_version", 1)))
+    if meta.get("schema_version", 1) < 3 and os.path.exists(ARCHIVE_FILE):
+        _migrate_archive()
+    _write_meta()
+
+
+def _migrate_archive() -> None:
+    """Переносит длинные тексты версий из архива в хранилище текстов"""
+    archive = _store_texts(_read_archive()).reindex(columns=DATA_COLUMNS + [ARCHIVED_AT_COLUMN])
+    data = gzip.compress(archive.to_csv(index=False).encode("utf-8"))
+    
+    def write(path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(data)
+    
+    replace_file(ARCHIVE_FILE, write)
+
+
+def _read_raw_data() -> pd.DataFrame:
+    """
+    Читает набор данных с диска без приведения к схеме
+    
+    Returns:
+        pd.DataFrame: Строки снимка и журнала (или базы SQLite)
     """
-    if not metrics_values:
-        return 0.0
-    return round(sum(metrics_values) / len(metrics_values), 2)
+    if STORAGE_MODE == "sqlite":
+        # Все колонки таблицы: набор колонок старой схемы мог отличаться
+        with _sqlite_connection() as conn:
+            return pd.read_sql_query("SELECT * FROM reports ORDER BY id", conn).drop(columns="id")
+    
+    path = _snapshot_file()
+    frames = []
+    if os.path.exists(path):
+        if STORAGE_MODE == "parquet":
+            frames.append(pd.read_parquet(path))
+        else:
+            try:
+                frames.append(pd.read_csv(path, dtype=object))
+            except pd.errors.EmptyDataError:
+                pass
+    journal = _read_journals()
+    if journal:
+        frames.append(pd.DataFrame.from_records(journal))
+    if not frames:
+        return pd.DataFrame(columns=DATA_COLUMNS)
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
 
 
+@profiled
 def create_data_row(
     direction: str,
     month: str,
@@ -92,7 +2288,7 @@ def create_data_row(
         direction: Направление
         month: Месяц в формате YYYY-MM
         stage: Стадия развития
-        metrics: Список значений метрик
+        metrics: Список значений метрик в порядке METRICS
         portfolio: Значение портфеля
         ambition: Значение амбиции
         value_text: Текстовая метрика
@@ -105,17 +2301,12 @@ def create_data_row(
     Returns:
         pd.DataFrame: DataFrame с одной строкой данных
     """
-    overall = calculate_overall_score(metrics)
-    
     data = {
         "Направление": [direction],
         "Месяц": [month],
         "Стадия": [stage],
-        METRICS[0]: [metrics[0]],
-        METRICS[1]: [metrics[1]],
-        METRICS[2]: [metrics[2]],
-        METRICS[3]: [metrics[3]],
-        "Общая цифра": [overall],
+        **{metric: [value] for metric, value in zip(METRICS, metrics)},
+        "Общая цифра": [None],
         NUMERIC_METRICS[0]: [portfolio],
         NUMERIC_METRICS[1]: [ambition],
         TEXT_METRIC: [value_text],
@@ -126,69 +2317,4 @@ def create_data_row(
         NEW_TEXT_FIELDS[4]: [management_decisions]
     }
     
-    return pd.DataFrame.from_dict(data)
-
-
-def load_default_values() -> dict:
-    """
-    Загружает последние значения по умолчанию для каждого направления
-    
-    Returns:
-        dict: Словарь вида {direction: {field_name: last_value}}
-    """
-    if os.path.exists(AUTOCOMPLETE_FILE):
-        try:
-            with open(AUTOCOMPLETE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
-    else:
-        return {}
-
-
-def save_default_values(default_values: dict) -> None:
-    """
-    Сохраняет последние значения по умолчанию для каждого направления
-    
-    Args:
-        default_values: Словарь вида {direction: {field_name: last_value}}
-    """
-    with open(AUTOCOMPLETE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(default_values, f, ensure_ascii=False, indent=2)
-
-
-def update_default_value(direction: str, field_name: str, value: str) -> None:
-    """
-    Обновляет последнее значение для конкретного направления и поля
-    
-    Args:
-        direction: Название направления
-        field_name: Название поля
-        value: Новое значение
-    """
-    if not value or not value.strip():
-        return
-    
-    default_values = load_default_values()
-    
-    if direction not in default_values:
-        default_values[direction] = {}
-    
-    default_values[direction][field_name] = value
-    
-    save_default_values(default_values)
-
-
-def get_default_value(direction: str, field_name: str) -> str:
-    """
-    Получает последнее значение для конкретного направления и поля
-    
-    Args:
-        direction: Название направления
-        field_name: Название поля
-        
-    Returns:
-        str: Последнее значение или пустая строка
-    """
-    default_values = load_default_values()
-    return default_values.get(direction, {}).get(field_name, "")
+    return recompute_derived(pd.DataFrame.from_dict(data))
@@ -0,0 +1,102 @@
+"""
+Модуль вспомогательных операций с файлами
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: блокировка файлов через msvcrt
+    fcntl = None
+    import msvcrt
+
+# Маска прав процесса: os.umask меняет ее, поэтому читается один раз при импорте
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def file_fingerprint(path: str) -> tuple | None:
+    """
+    Возвращает отпечаток файла для проверки его изменения
+    
+    Args:
+        path: Путь к файлу
+        
+    Returns:
+        tuple | None: (inode, размер, время изменения) или None, если файла нет
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def replace_file(path: str, write) -> None:
+    """
+    Атомарно заменяет файл: пишет во временный файл и подменяет им исходный
+    
+    Читатели видят либо старую, либо новую версию файла, но не недописанную.
+    Права доступа сохраняются прежние, у нового файла — обычные для процесса.
+    
+    Args:
+        path: Путь к заменяемому файлу
+        write: Функция, записывающая содержимое по переданному пути
+    """
+    # Уникальное имя: другие процессы могут одновременно заменять тот же файл
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        # mkstemp создает файл с правами 0600: без этого файлы данных и выгрузки
+        # стали бы недоступны другим пользователям после первой записи
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Захватывает межпроцессную блокировку на время выполнения блока
+    
+    Блокировка ставится средствами ОС на файл path (создается при первом
+    обращении) и снимается при выходе из блока или завершении процесса.
+    Внутри одного процесса блокировку должен захватывать один поток за раз.
+    
+    Args:
+        path: Путь к файлу блокировки
+    """
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK сдается после 10 попыток; ждем дальше
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,207 @@
+"""
+Модуль выгрузки отчетов за месяц в единый HTML файл
+
+Для каждого направления с отчетом за выбранный месяц строятся радиальная
+диаграмма метрик и столбчатые диаграммы финансовых показателей, к ним
+добавляются текстовые поля. Диаграммы строятся параллельно в пуле процессов,
+библиотека plotly.js встраивается в файл один раз.
+
+Пример:
+    python html_export.py 2025-08 --output report_2025-08.html
+"""
+
+import os
+import html
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from config import (
+    CATEGORIES,
+    METRICS,
+    NUMERIC_METRICS,
+    TEXT_METRIC,
+    NEW_TEXT_FIELDS,
+    COLORS,
+    CHART_CONFIG
+)
+
+
+def _collect_tasks(month: str) -> list[dict]:
+    """
+    Собирает данные отчетов всех направлений за месяц
+    
+    Args:
+        month: Месяц в формате YYYY-MM
+        
+    Returns:
+        list[dict]: Данные для построения блока каждого направления
+            в порядке CATEGORIES
+    """
+    import pandas as pd
+    from data_manager import get_report, get_report_texts, get_direction_rollup
+    
+    tasks = []
+    for category_label, directions in CATEGORIES.items():
+        for direction in directions:
+            row = get_report(direction, month)
+            if row is None:
+                continue
+            tasks.append({
+                "category": category_label,
+                "direction": direction,
+                "month": month,
+                "row": {key: (None if pd.isna(value) else value) for key, value in row.items()},
+                "texts": get_report_texts(row),
+                # Динамика показателей до выбранного месяца включительно
+                "rollups": {
+                    metric: get_direction_rollup(direction, metric, end=month)["mean"]
+                    for metric in NUMERIC_METRICS
+                }
+            })
+    return tasks
+
+
+def _render_direction(task: dict) -> str:
+    """
+    Строит HTML блок одного направления (выполняется в процессе пула)
+    
+    Args:
+        task: Данные направления (см. _collect_tasks)
+        
+    Returns:
+        str: HTML блок с диаграммами и текстовыми полями
+    """
+    from visualization import create_radar_chart, create_bar_chart
+    
+    row = {**task["row"], **task["texts"]}
+    
+    def figure_html(fig) -> str:
+        return fig.to_html(full_html=False, include_plotlyjs=False, config=CHART_CONFIG)
+    
+    parts = [f"<h2>{html.escape(task['direction'])} — {task['month']}</h2>"]
+    
+    summary = []
+    if row.get("Стадия"):
+        summary.append(f"Стадия: {html.escape(str(row['Стадия']))}")
+    if row.get("Общая цифра") is not None:
+        summary.append(f"Общая цифра: {float(row['Общая цифра']):.2f}")
+    if row.get(NEW_TEXT_FIELDS[0]):
+        summary.append(f"Лидер: {html.escape(str(row[NEW_TEXT_FIELDS[0]]))}")
+    for metric in NUMERIC_METRICS:
+        if row.get(metric) is not None:
+            summary.append(f"{html.escape(metric)}: {row[metric]}")
+    if summary:
+        parts.append("<p>" + " · ".join(summary) + "</p>")
+    
+    charts = []
+    if all(row.get(metric) is not None for metric in METRICS):
+        charts.append(figure_html(create_radar_chart([round(float(row[m]), 2) for m in METRICS])))
+    for metric, values in task["rollups"].items():
+        if len(values) > 0:
+            charts.append(figure_html(create_bar_chart(values, metric)))
+    parts.append("<div class='charts'>" + "".join(f"<div>{chart}</div>" for chart in charts) + "</div>")
+    
+    for field in [TEXT_METRIC] + NEW_TEXT_FIELDS:
+        if row.get(field):
+            text = html.escape(str(row[field])).replace("\n", "<br>")
+            parts.append(f"<h3>{html.escape(field)}</h3><p>{text}</p>")
+    
+    return "<section>" + "".join(parts) + "</section>"
+
+
+def _page_html(month: str, sections: list[tuple[str, str]]) -> str:
+    """
+    Собирает итоговую HTML страницу с одной копией plotly.js
+    
+    Args:
+        month: Месяц в формате YYYY-MM
+        sections: Пары (категория, HTML блок направления) в порядке вывода
+        
+    Returns:
+        str: Полный HTML документ
+    """
+    from plotly.offline import get_plotlyjs
+    
+    body = []
+    current_category = None
+    for category_label, section in sections:
+        if category_label != current_category:
+            body.append(f"<h1>{html.escape(category_label)}</h1>")
+            current_category = category_label
+        body.append(section)
+    if not body:
+        body.append("<p>Отчетов за выбранный месяц нет.</p>")
+    
+    return f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Отчеты по направлениям — {month}</title>
+<script type="text/javascript">{get_plotlyjs()}</script>
+<style>
+body {{ background: {COLORS["background"]}; color: {COLORS["text"]}; font-family: sans-serif; margin: 2rem; }}
+section {{ border-bottom: 1px solid {COLORS["grid"]}; padding-bottom: 1rem; margin-bottom: 1rem; }}
+.charts {{ display: flex; flex-wrap: wrap; gap: 1rem; align-items: flex-start; }}
+.charts > div {{ flex: 1 1 350px; }}
+</style>
+</head>
+<body>
+<h1>📊 Отчеты по направлениям — {month}</h1>
+{"".join(body)}
+</body>
+</html>
+"""
+
+
+def export_month_html(month: str, path: str, workers: int | None = None) -> int:
+    """
+    Выгружает отчеты всех направлений за месяц в единый HTML файл
+    
+    Args:
+        month: Месяц в формате YYYY-MM
+        path: Путь к HTML файлу
+        workers: Число процессов пула (None — по числу ядер)
+        
+    Returns:
+        int: Число выгруженных направлений
+        
+    Raises:
+        ValueError: Если месяц не в формате YYYY-MM
+    """
+    from data_manager import normalize_month
+    from file_utils import replace_file
+    
+    month = normalize_month(month)
+    tasks = _collect_tasks(month)
+    
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            sections = list(executor.map(_render_direction, tasks))
+    else:
+        sections = []
+    
+    page = _page_html(month, [(task["category"], section) for task, section in zip(tasks, sections)])
+    
+    def write(tmp_path: str) -> None:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(page)
+    
+    replace_file(path, write)
+    return len(tasks)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Точка входа командной строки"""
+    parser = argparse.ArgumentParser(description="Выгрузка отчетов за месяц в HTML файл")
+    parser.add_argument("month", help="месяц в формате YYYY-MM")
+    parser.add_argument("--output", help="HTML файл (по умолчанию report_<месяц>.html)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="число процессов для построения диаграмм")
+    args = parser.parse_args(argv)
+    
+    output = args.output or f"report_{args.month}.html"
+    count = export_month_html(args.month, output, args.workers)
+    print(f"Выгружено направлений: {count} → {output}")
+
+
+if __name__ == "__main__":
+    main()
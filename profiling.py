@@ -0,0 +1,94 @@
+"""
+Модуль замеров времени выполнения
+"""
+
+import json
+import time
+import logging
+import threading
+from functools import wraps
+from config import PROFILING_ENABLED
+
+
+# Журнал замеров: по одной записи JSON на перезапуск скрипта
+logger = logging.getLogger("akm_dashboard.profiling")
+
+# Замеры текущего перезапуска в потоке сессии
+_local = threading.local()
+
+if PROFILING_ENABLED and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+
+def profiled(func=None, *, reads_file: bool = False):
+    """
+    Декоратор: учитывает время и число вызовов функции в текущем перезапуске
+    
+    Если замеры выключены (PROFILING_ENABLED), функция возвращается без
+    обертки и не несет никаких накладных расходов. Время вложенных вызовов
+    входит во время внешних.
+    
+    Args:
+        func: Оборачиваемая функция
+        reads_file: Функция читает файл данных (учитывается в числе чтений)
+        
+    Returns:
+        Обернутая функция
+    """
+    if func is None:
+        return lambda f: profiled(f, reads_file=reads_file)
+    if not PROFILING_ENABLED:
+        return func
+    
+    name = f"{func.__module__}.{func.__qualname__}"
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = getattr(_local, "stats", None)
+        if stats is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            entry = stats["functions"].setdefault(name, {"calls": 0, "time": 0.0})
+            entry["calls"] += 1
+            entry["time"] += time.perf_counter() - start
+            if reads_file:
+                stats["file_reads"] += 1
+    
+    return wrapper
+
+
+def start_rerun() -> None:
+    """Начинает сбор замеров для перезапуска скрипта в текущем потоке"""
+    if PROFILING_ENABLED:
+        _local.stats = {"started": time.perf_counter(), "file_reads": 0, "functions": {}}
+
+
+def finish_rerun(page: str) -> dict | None:
+    """
+    Завершает сбор замеров перезапуска и записывает их в журнал
+    
+    Args:
+        page: Открытый раздел приложения
+        
+    Returns:
+        dict | None: {"page", "total", "file_reads", "functions": {имя: {"calls", "time"}}}
+            или None, если замеры выключены
+    """
+    stats = getattr(_local, "stats", None)
+    if stats is None:
+        return None
+    _local.stats = None
+    
+    report = {
+        "page": page,
+        "total": time.perf_counter() - stats.pop("started"),
+        **stats
+    }
+    logger.info(json.dumps(report, ensure_ascii=False))
+    return report
@@ -0,0 +1,18 @@
+"""
+Модуль расчета оценок
+"""
+
+
+def calculate_overall_score(metrics_values: list[float]) -> float:
+    """
+    Вычисляет общую оценку как среднее арифметическое метрик
+    
+    Args:
+        metrics_values: Список значений метрик
+        
+    Returns:
+        float: Среднее значение метрик, округленное до 2 знаков
+    """
+    if not metrics_values:
+        return 0.0
+    return round(sum(metrics_values) / len(metrics_values), 2)
@@ -0,0 +1,245 @@
+"""
+Модуль полнотекстового поиска по текстовым полям отчетов
+
+Обратный индекс {основа слова: {(направление, месяц): число вхождений}}
+строится по полям TEXT_METRIC и NEW_TEXT_FIELDS последних отчетов
+и перед каждым поиском дочитывает отчеты, сохраненные после построения
+(в том числе другими процессами приложения). Слова приводятся к нижнему
+регистру, ё заменяется на е, у русских слов отбрасываются окончания,
+поэтому "поставщик", "поставщика" и "поставщиками" находятся одним запросом.
+Найденные отчеты упорядочиваются по весу TF-IDF.
+"""
+
+import re
+import math
+import threading
+from collections import Counter
+from functools import lru_cache
+from config import TEXT_METRIC, NEW_TEXT_FIELDS, SEARCH_RESULT_LIMIT, SEARCH_SNIPPET_LENGTH
+from profiling import profiled
+
+
+# Поля, по которым выполняется поиск
+SEARCH_FIELDS = [TEXT_METRIC] + NEW_TEXT_FIELDS
+
+# Окончания русских слов, отбрасываемые при выделении основы (сначала длинные)
+ENDINGS = sorted([
+    "иями", "ями", "ами", "ией", "иям", "ием", "иях", "ость", "ости", "остью",
+    "ого", "его", "ому", "ему", "ыми", "ими", "ать", "ять", "ить", "еть", "ует", "уют",
+    "ей", "ой", "ий", "ый", "ое", "ее", "ие", "ые", "ая", "яя", "ую", "юю", "ия", "ию", "ии",
+    "ых", "их", "ом", "ем", "ам", "ям", "ах", "ях", "ов", "ев", "ью", "ья", "ют", "ут",
+    "ет", "ит", "ат", "ят", "ла", "ли", "ло", "ть",
+    "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й"
+], key=len, reverse=True)
+
+# Наименьшая длина основы после отбрасывания окончания
+MIN_STEM_LENGTH = 3
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Индекс: {"postings": {основа: {ключ: число вхождений}},
+# "documents": {ключ: Counter основ}, "cursor": позиция в изменениях отчетов
+# (см. data_manager.get_report_changes)}; ключ — (направление, месяц YYYY-MM).
+# None — еще не построен
+_index = None
+_index_lock = threading.Lock()
+
+
+def _stem(word: str) -> str:
+    """Отбрасывает окончание русского слова (слово уже в нижнем регистре)"""
+    for ending in ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    return word
+
+
+def _words(text: str) -> list[re.Match]:
+    """Возвращает найденные в тексте слова (совпадения с позициями)"""
+    return list(_WORD_PATTERN.finditer(text))
+
+
+# Словарь отчетов невелик, поэтому основы слов запоминаются
+@lru_cache(maxsize=65536)
+def _normalize(word: str) -> str:
+    """Приводит слово к основе: нижний регистр, е вместо ё, без окончания"""
+    return _stem(word.casefold().replace("ё", "е"))
+
+
+def tokenize(text) -> list[str]:
+    """
+    Разбивает текст на основы слов
+    
+    Args:
+        text: Текст (не строки дают пустой список)
+        
+    Returns:
+        list[str]: Основы слов в порядке текста; однобуквенные слова пропускаются
+    """
+    if not isinstance(text, str):
+        return []
+    return [_normalize(match.group()) for match in _words(text) if len(match.group()) > 1]
+
+
+def _add_document(index: dict, record: dict) -> None:
+    """
+    Добавляет отчет в индекс, заменяя прежнюю версию отчета за тот же месяц
+    
+    Args:
+        index: Поисковый индекс
+        record: Запись отчета с полями "Направление", "Месяц" и SEARCH_FIELDS
+    """
+    key = (record["Направление"], str(record["Месяц"])[:7])
+    postings = index["postings"]
+    
+    previous = index["documents"].pop(key, None)
+    for stem in previous or ():
+        documents = postings[stem]
+        del documents[key]
+        if not documents:
+            del postings[stem]
+    
+    stems = Counter(stem for field in SEARCH_FIELDS for stem in tokenize(record.get(field)))
+    for stem, count in stems.items():
+        postings.setdefault(stem, {})[key] = count
+    index["documents"][key] = stems
+
+
+@profiled
+def _build_index() -> dict:
+    """
+    Строит поисковый индекс по последним отчетам
+    
+    Returns:
+        dict: Поисковый индекс
+    """
+    from data_manager import load_data, with_texts
+    
+    index = {"postings": {}, "documents": {}}
+    # Строки идут в порядке сохранения: поздняя версия отчета заменяет раннюю
+    data = with_texts(load_data())
+    for record in data[["Направление", "Месяц"] + SEARCH_FIELDS].to_dict("records"):
+        _add_document(index, record)
+    return index
+
+
+def _add_documents(index: dict, records: list[dict]) -> None:
+    """
+    Добавляет в индекс отчеты, сохраненные после его построения
+    
+    Args:
+        index: Поисковый индекс
+        records: Записи отчетов в порядке сохранения (длинные тексты — ссылками)
+    """
+    import pandas as pd
+    from data_manager import with_texts
+    
+    data = with_texts(pd.DataFrame.from_records(records))
+    for record in data[["Направление", "Месяц"] + SEARCH_FIELDS].to_dict("records"):
+        _add_document(index, record)
+
+
+def _ensure_index() -> dict:
+    """
+    Возвращает актуальный поисковый индекс (вызывается под блокировкой)
+    
+    Новые отчеты дочитываются с позиции индекса; после перезаписи данных
+    индекс строится заново.
+    
+    Returns:
+        dict: Поисковый индекс
+    """
+    global _index
+    
+    from data_manager import get_report_changes
+    
+    records, cursor = get_report_changes("search", _index["cursor"] if _index is not None else None)
+    if records is None:
+        # Позиция берется до чтения данных: отчеты, сохраненные между ними,
+        # будут добавлены повторно, что лишь заменит их той же версией
+        _index = _build_index()
+    elif records:
+        _add_documents(_index, records)
+    _index["cursor"] = cursor
+    return _index
+
+
+def _snippet(texts: dict, stems: set[str]) -> tuple[str | None, str]:
+    """
+    Выбирает фрагмент текста отчета с первым найденным словом запроса
+    
+    Args:
+        texts: Тексты отчета {поле: текст}
+        stems: Основы слов запроса
+        
+    Returns:
+        tuple[str | None, str]: Поле и фрагмент длиной около SEARCH_SNIPPET_LENGTH
+            символов; (None, "") если слова не найдены
+    """
+    for field in SEARCH_FIELDS:
+        text = texts.get(field)
+        if not isinstance(text, str):
+            continue
+        for match in _words(text):
+            if _normalize(match.group()) not in stems:
+                continue
+            start = max(0, match.start() - SEARCH_SNIPPET_LENGTH // 3)
+            end = min(len(text), start + SEARCH_SNIPPET_LENGTH)
+            snippet = " ".join(text[start:end].split())
+            return field, ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+    return None, ""
+
+
+@profiled
+def search_reports(query: str, limit: int = SEARCH_RESULT_LIMIT) -> list[dict]:
+    """
+    Ищет отчеты, в текстовых полях которых есть все слова запроса
+    
+    Args:
+        query: Строка запроса
+        limit: Наибольшее число результатов
+        
+    Returns:
+        list[dict]: Результаты по убыванию веса (при равенстве — сначала новые):
+            {"Направление", "Месяц", "score", "field", "snippet"}, где field —
+            поле, из которого взят фрагмент snippet
+    """
+    from data_manager import get_report, get_report_texts
+    
+    stems = set(tokenize(query))
+    if not stems:
+        return []
+    
+    with _index_lock:
+        index = _ensure_index()
+        postings = [index["postings"].get(stem, {}) for stem in stems]
+        if not all(postings):
+            return []
+        total = len(index["documents"])
+        
+        # Кандидаты — отчеты из самого короткого списка, содержащие все основы
+        postings.sort(key=len)
+        scores = {}
+        for key in postings[0]:
+            if all(key in documents for documents in postings[1:]):
+                scores[key] = sum(
+                    documents[key] * math.log(1 + total / len(documents))
+                    for documents in postings
+                )
+    
+    ranked = sorted(scores, key=lambda key: key[1], reverse=True)
+    ranked.sort(key=lambda key: -scores[key])
+    results = []
+    for direction, month in ranked[:limit]:
+        row = get_report(direction, month)
+        if row is None:
+            continue
+        field, snippet = _snippet({**row.to_dict(), **get_report_texts(row)}, stems)
+        results.append({
+            "Направление": direction,
+            "Месяц": month,
+            "score": scores[(direction, month)],
+            "field": field,
+            "snippet": snippet
+        })
+    return results
+
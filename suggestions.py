@@ -0,0 +1,276 @@
+"""
+Модуль подсказок для текстовых полей отчета
+
+Для каждого поля SUGGESTION_FIELDS строится индекс по началу значения:
+{начало значения: [значения по убыванию веса]}. Вес значения складывается
+из весов его использований: использование в месяце m весит
+2^(m / SUGGESTION_HALF_LIFE_MONTHS), поэтому частые значения поднимаются
+выше, а давние постепенно уступают новым. Веса хранятся как логарифмы
+по основанию 2: они не переполняются и не зависят от текущей даты.
+
+Сначала индекс строится по значениям из файла автозаполнения, затем
+в фоновом потоке дополняется историей отчетов (включая архив), а при
+изменении файлов данных дочитывает новые отчеты, в том числе сохраненные
+другими процессами приложения. История читается через data_manager
+(pandas), поэтому ее загрузка начинается, только когда данные уже
+загружены другим разделом или сохранением отчета: первая отрисовка
+страницы ввода обходится без pandas.
+"""
+
+import sys
+import math
+import threading
+from bisect import bisect_left, insort
+from config import (
+    SUGGESTION_FIELDS,
+    SUGGESTION_LIMIT,
+    SUGGESTION_PREFIX_LENGTH,
+    SUGGESTION_HALF_LIFE_MONTHS
+)
+from change_watcher import watched_state
+from profiling import profiled
+
+
+# Индекс подсказок: {"scores": {поле: {значение: вес}},
+# "prefixes": {поле: {начало: [значения]}}, "cursor": позиция в изменениях
+# отчетов (см. data_manager.get_report_changes; None — история не загружена),
+# "state": отпечаток файлов данных при последнем обновлении}; None — еще не построен
+_index = None
+_index_lock = threading.Lock()
+
+# Фоновый поток загрузки истории и дочитывания новых отчетов
+_sync_thread = None
+
+
+def _normalize(text: str) -> str:
+    """Приводит значение к виду для сравнения начала строки (регистр, е/ё)"""
+    return text.casefold().replace("ё", "е")
+
+
+def _use_weight(month) -> float:
+    """
+    Возвращает логарифм веса использования значения в месяце
+    
+    Args:
+        month: Месяц (период или строка YYYY-MM; None — без даты)
+        
+    Returns:
+        float: Номер месяца от января 1970 года в периодах полураспада;
+            0 для значений без даты
+    """
+    if month is None:
+        return 0.0
+    try:
+        year, number = str(month)[:7].split("-")
+        return ((int(year) - 1970) * 12 + int(number) - 1) / SUGGESTION_HALF_LIFE_MONTHS
+    except ValueError:
+        return 0.0
+
+
+def _combine(score: float | None, weight: float) -> float:
+    """Складывает веса, заданные логарифмами по основанию 2"""
+    if score is None:
+        return weight
+    return max(score, weight) + math.log2(1 + 2 ** -abs(score - weight))
+
+
+def _prefix_keys(value: str) -> list[str]:
+    """Возвращает индексируемые начала значения, включая пустое"""
+    normalized = _normalize(value)[:SUGGESTION_PREFIX_LENGTH]
+    return [normalized[:length] for length in range(len(normalized) + 1)]
+
+
+def _clean(value) -> str | None:
+    """Возвращает значение без крайних пробелов или None для пустого"""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return value.strip()
+
+
+def _add_use(index: dict, field: str, value, month) -> None:
+    """
+    Учитывает в построенном индексе новое использование значения поля
+    
+    Args:
+        index: Индекс подсказок
+        field: Название поля
+        value: Введенное значение (пустые пропускаются)
+        month: Месяц использования
+    """
+    value = _clean(value)
+    if value is None:
+        return
+    scores = index["scores"][field]
+    prefixes = index["prefixes"][field]
+    
+    def rank(item: str) -> tuple:
+        return (-scores[item], item)
+    
+    keys = _prefix_keys(value)
+    if value in scores:
+        # Значение переставляется: сначала убираем его с прежнего места
+        for key in keys:
+            values = prefixes[key]
+            del values[bisect_left(values, rank(value), key=rank)]
+    scores[value] = _combine(scores.get(value), _use_weight(month))
+    for key in keys:
+        insort(prefixes.setdefault(key, []), value, key=rank)
+
+
+def _add_default_uses(scores: dict) -> None:
+    """
+    Учитывает значения файла автозаполнения (без даты): списки верхнего
+    уровня вида {поле: [значения]} и последние значения направлений
+    
+    Args:
+        scores: Веса значений {поле: {значение: вес}}
+    """
+    from autocomplete import load_default_values
+    
+    for key, values in load_default_values().items():
+        if key in scores and isinstance(values, list):
+            uses = [(key, value) for value in values]
+        elif isinstance(values, dict):
+            uses = [(field, values.get(field)) for field in SUGGESTION_FIELDS]
+        else:
+            continue
+        for field, value in uses:
+            value = _clean(value)
+            if value is not None:
+                scores[field][value] = _combine(scores[field].get(value), _use_weight(None))
+
+
+def _add_history_uses(scores: dict) -> None:
+    """
+    Учитывает значения отчетов из рабочих данных и архива
+    
+    Читаются только месяц и поля SUGGESTION_FIELDS, без хранилища длинных текстов.
+    
+    Args:
+        scores: Веса значений {поле: {значение: вес}}
+    """
+    from data_manager import load_data, get_archived_revisions
+    
+    columns = ["Месяц"] + SUGGESTION_FIELDS
+    for frame in (get_archived_revisions()[columns], load_data(columns)):
+        for record in frame.to_dict("records"):
+            weight = _use_weight(record["Месяц"])
+            for field in SUGGESTION_FIELDS:
+                value = _clean(record[field])
+                if value is not None:
+                    scores[field][value] = _combine(scores[field].get(value), weight)
+
+
+def _make_index(scores: dict) -> dict:
+    """
+    Строит индекс подсказок по весам значений
+    
+    Args:
+        scores: Веса значений {поле: {значение: вес}}
+        
+    Returns:
+        dict: Индекс подсказок без истории отчетов
+    """
+    # Значения добавляются по убыванию веса, поэтому списки сразу упорядочены
+    index = {"scores": scores, "prefixes": {}, "cursor": None, "state": None}
+    for field, field_scores in scores.items():
+        prefixes = index["prefixes"][field] = {}
+        for value in sorted(field_scores, key=lambda item: (-field_scores[item], item)):
+            for key in _prefix_keys(value):
+                prefixes.setdefault(key, []).append(value)
+    return index
+
+
+@profiled
+def _sync_history() -> None:
+    """
+    Загружает в индекс историю отчетов или дочитывает новые отчеты (в фоновом потоке)
+    
+    Если данные были перезаписаны (см. data_manager.get_report_changes),
+    индекс строится заново с историей.
+    """
+    global _index, _sync_thread
+    
+    from data_manager import get_report_changes
+    
+    try:
+        state = watched_state("data")
+        records, cursor = get_report_changes("suggestions", _index["cursor"])
+        if records is None:
+            # Позиция берется до чтения истории: отчеты, сохраненные между
+            # ними, будут учтены повторно, что лишь немного завысит их вес
+            scores = {field: {} for field in SUGGESTION_FIELDS}
+            _add_default_uses(scores)
+            _add_history_uses(scores)
+            index = _make_index(scores)
+        else:
+            index = _index
+        with _index_lock:
+            for record in records or ():
+                for field in SUGGESTION_FIELDS:
+                    _add_use(index, field, record.get(field), record.get("Месяц"))
+            index["cursor"] = cursor
+            index["state"] = state
+            _index = index
+    finally:
+        with _index_lock:
+            # При ошибке следующее обращение запустит обновление заново
+            _sync_thread = None
+
+
+def _ensure_index() -> dict:
+    """
+    Возвращает индекс подсказок
+    
+    При первом обращении индекс строится по файлу автозаполнения; история
+    отчетов загружается и новые отчеты дочитываются в фоне, если data_manager
+    уже загружен.
+    
+    Returns:
+        dict: Индекс подсказок
+    """
+    global _index, _sync_thread
+    
+    with _index_lock:
+        if _index is None:
+            scores = {field: {} for field in SUGGESTION_FIELDS}
+            _add_default_uses(scores)
+            _index = _make_index(scores)
+        if _sync_thread is None and "data_manager" in sys.modules and (
+            _index["cursor"] is None or _index["state"] != watched_state("data")
+        ):
+            _sync_thread = threading.Thread(
+                target=_sync_history,
+                name="suggestions-sync",
+                daemon=True
+            )
+            _sync_thread.start()
+        return _index
+
+
+@profiled
+def get_suggestions(field: str, prefix: str = "", limit: int = SUGGESTION_LIMIT) -> list[str]:
+    """
+    Возвращает ранее введенные значения поля, начинающиеся с prefix
+    
+    Пока история отчетов загружается в фоне, подсказки берутся только
+    из файла автозаполнения; новые отчеты учитываются после их дочитывания
+    в фоне (обычно к следующему обращению).
+    
+    Args:
+        field: Название поля из SUGGESTION_FIELDS
+        prefix: Начало значения (без учета регистра и различия е/ё)
+        limit: Наибольшее число значений
+        
+    Returns:
+        list[str]: Значения по убыванию веса
+    """
+    index = _ensure_index()
+    key = _normalize(prefix.lstrip())
+    with _index_lock:
+        values = index["prefixes"][field].get(key[:SUGGESTION_PREFIX_LENGTH], [])
+        if len(key) <= SUGGESTION_PREFIX_LENGTH:
+            return values[:limit]
+        # Ввод длиннее индексируемого начала проверяется по списку кандидатов
+        return [value for value in values if _normalize(value).startswith(key)][:limit]
+
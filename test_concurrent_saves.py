@@ -0,0 +1,148 @@
+"""
+Нагрузочная проверка одновременных сохранений отчетов
+
+В каждом режиме хранения несколько процессов приложения с несколькими
+потоками одновременно сохраняют отчеты в одну папку данных, а потоки-читатели
+тем временем загружают данные. После завершения каждый сохраненный отчет
+должен найтись в рабочих данных или в архиве ровно один раз, а читатели
+не должны получать ошибок.
+
+Пример:
+    python -m pytest test_concurrent_saves.py
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+
+import pytest
+
+
+# Папка приложения (добавляется в sys.path процессов-сохранителей)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Число процессов, потоков сохранения в каждом и сохранений в потоке
+PROCESSES = 2
+THREADS = 8
+SAVES_PER_THREAD = 20
+
+# Направление и месяц всех сохранений: повторные отчеты уходят в архив
+DIRECTION = "ПО"
+MONTH = "2025-01"
+
+# Процесс-сохранитель: потоки сохраняют отчеты с уникальным номером
+# в первом финансовом показателе, читатели загружают данные до конца сохранений
+WORKER_SCRIPT = """
+import json, sys, time, threading
+sys.path.insert(0, {app_dir!r})
+import config
+config.STORAGE_MODE = {storage_mode!r}
+import data_manager
+
+# Частое сжатие журнала, чтобы оно пересекалось с записями другого процесса
+data_manager.JOURNAL_COMPACT_THRESHOLD = 25
+
+errors = []
+done = threading.Event()
+
+def reader():
+    while not done.is_set():
+        try:
+            data_manager.load_data()
+            data_manager.get_report({direction!r}, {month!r})
+            data_manager.load_default_values()
+        except Exception as error:
+            errors.append(repr(error))
+
+def saver(thread):
+    for i in range({saves}):
+        number = ({process} * {threads} + thread) * {saves} + i
+        try:
+            data_manager.append_report(data_manager.create_data_row(
+                {direction!r}, {month!r}, config.STAGE_OPTIONS[0], [5] * len(config.METRICS),
+                number, 0, "ценность", "лидер", "магниты", "источник", "стратегия", "решения"
+            ))
+            data_manager.update_default_values({direction!r}, {{config.NEW_TEXT_FIELDS[0]: str(number)}})
+        except Exception as error:
+            errors.append(repr(error))
+
+time.sleep(max(0, {start_at!r} - time.time()))
+readers = [threading.Thread(target=reader) for _ in range(2)]
+savers = [threading.Thread(target=saver, args=(thread,)) for thread in range({threads})]
+for thread in readers + savers:
+    thread.start()
+for thread in savers:
+    thread.join()
+done.set()
+for thread in readers:
+    thread.join()
+print(json.dumps({{"errors": errors}}))
+"""
+
+# Проверка результата в отдельном процессе: номера сохраненных отчетов
+CHECK_SCRIPT = """
+import json, sys
+sys.path.insert(0, {app_dir!r})
+import config
+config.STORAGE_MODE = {storage_mode!r}
+import data_manager
+from autocomplete import load_default_values
+
+history = data_manager.get_direction_history({direction!r})
+print(json.dumps({{
+    "numbers": [int(value) for value in history[config.NUMERIC_METRICS[0]]],
+    "autocomplete": load_default_values().get({direction!r}, {{}})
+}}))
+"""
+
+
+def run_script(script: str, cwd: str, timeout: float = 300) -> dict:
+    """
+    Выполняет скрипт в новом процессе Python и разбирает его вывод
+    
+    Args:
+        script: Текст скрипта, последней строкой выводящего JSON
+        cwd: Папка данных
+        timeout: Время ожидания, с
+        
+    Returns:
+        dict: Разобранная последняя строка вывода
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=cwd, capture_output=True, text=True, timeout=timeout
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("storage_mode", ["journal", "csv", "sqlite", "parquet"])
+def test_concurrent_saves(storage_mode, tmp_path):
+    """Одновременные сохранения нескольких процессов не теряют и не дублируют отчеты"""
+    params = {
+        "app_dir": APP_DIR,
+        "storage_mode": storage_mode,
+        "direction": DIRECTION,
+        "month": MONTH,
+        "threads": THREADS,
+        "saves": SAVES_PER_THREAD
+    }
+    start_at = time.time() + 3
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER_SCRIPT.format(process=process, start_at=start_at, **params)],
+            cwd=tmp_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for process in range(PROCESSES)
+    ]
+    for worker in workers:
+        stdout, stderr = worker.communicate(timeout=600)
+        assert worker.returncode == 0, stderr
+        assert json.loads(stdout.strip().splitlines()[-1])["errors"] == []
+    
+    result = run_script(CHECK_SCRIPT.format(**params), tmp_path)
+    total = PROCESSES * THREADS * SAVES_PER_THREAD
+    assert sorted(result["numbers"]) == list(range(total))
+    assert result["autocomplete"]
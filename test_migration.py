@@ -0,0 +1,74 @@
+"""
+Проверка миграции данных при изменении набора метрик
+
+Данные, сохраненные с одним набором METRICS, должны загружаться
+и дополняться после добавления метрики в конфигурацию: недостающая
+колонка добавляется пустой, прежние значения сохраняются.
+
+Пример:
+    python -m pytest test_migration.py
+"""
+
+import pytest
+
+from test_concurrent_saves import APP_DIR, run_script
+
+
+# Сохранение двух версий отчета за месяц с текущим набором метрик
+SAVE_SCRIPT = """
+import json, sys
+sys.path.insert(0, {app_dir!r})
+import config
+config.STORAGE_MODE = {storage_mode!r}
+import data_manager
+
+for value in (3, 4):
+    data_manager.append_report(data_manager.create_data_row(
+        "ПО", "2025-01", config.STAGE_OPTIONS[0], [value] * len(config.METRICS),
+        1, 2, "ценность", "лидер", "магниты", "источник", "стратегия", "решения"
+    ))
+print(json.dumps({{}}))
+"""
+
+# Загрузка и сохранение после добавления метрики в конфигурацию
+CHANGED_SCRIPT = """
+import json, sys
+sys.path.insert(0, {app_dir!r})
+import config
+config.STORAGE_MODE = {storage_mode!r}
+config.METRICS = config.METRICS + ["Новая метрика"]
+import data_manager
+
+before = data_manager.load_data()
+for month, value in (("2025-02", 5), ("2025-01", 6)):
+    data_manager.append_report(data_manager.create_data_row(
+        "ПО", month, config.STAGE_OPTIONS[0], [value] * len(config.METRICS),
+        1, 2, "ценность", "лидер", "магниты", "источник", "стратегия", "решения"
+    ))
+after = data_manager.load_data()
+history = data_manager.get_direction_history("ПО")
+print(json.dumps({{
+    "before": before[config.METRICS[0]].tolist(),
+    "new_before": before["Новая метрика"].isna().all().item(),
+    "new_after": after["Новая метрика"].dropna().tolist(),
+    "report": float(data_manager.get_report("ПО", "2025-02")[config.METRICS[0]]),
+    "history": sorted(history[config.METRICS[0]].tolist()),
+    "new_history": sorted(history["Новая метрика"].dropna().tolist())
+}}))
+"""
+
+
+@pytest.mark.parametrize("storage_mode", ["journal", "csv", "sqlite", "parquet"])
+def test_metric_added(storage_mode, tmp_path):
+    """Добавление метрики в METRICS не мешает загружать и сохранять прежние данные и архив"""
+    params = {"app_dir": APP_DIR, "storage_mode": storage_mode}
+    run_script(SAVE_SCRIPT.format(**params), tmp_path)
+    
+    result = run_script(CHANGED_SCRIPT.format(**params), tmp_path)
+    assert result["before"][-1] == 4
+    assert result["new_before"]
+    assert sorted(result["new_after"]) == [5, 6]
+    assert result["report"] == 5
+    # Версии в архиве, записанные до и после изменения метрик, читаются вместе
+    assert result["history"] == [3, 4, 5, 6]
+    assert result["new_history"] == [5, 6]
@@ -0,0 +1,110 @@
+"""
+Модуль хранилища длинных текстов отчетов
+
+Длинные текстовые поля (LONG_TEXT_FIELDS) хранятся отдельно от набора
+данных в базе SQLite: одна запись на отчет, ключ записи сохраняется
+в наборе данных. Записи только добавляются и не изменяются, поэтому
+ключ однозначно определяет тексты отчета.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from config import TEXT_STORE_FILE, LONG_TEXT_FIELDS
+from profiling import profiled
+
+
+# Создана ли в этом процессе схема хранилища
+_store_ready = False
+
+
+def _quote(name: str) -> str:
+    """Экранирует имя колонки для SQL"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+@contextmanager
+def _connection():
+    """
+    Открывает соединение с хранилищем текстов и создает схему при первом обращении
+    
+    Изменения фиксируются при успешном выходе из блока и откатываются при ошибке.
+    
+    Yields:
+        sqlite3.Connection: Соединение с базой
+    """
+    global _store_ready
+    
+    conn = sqlite3.connect(TEXT_STORE_FILE, timeout=30)
+    try:
+        if not _store_ready:
+            columns_sql = ", ".join(f"{_quote(field)} TEXT" for field in LONG_TEXT_FIELDS)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS texts "
+                f"(id INTEGER PRIMARY KEY AUTOINCREMENT, {columns_sql})"
+            )
+            conn.commit()
+            _store_ready = True
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def store_texts(records: list[dict]) -> list[int]:
+    """
+    Сохраняет тексты отчетов одной транзакцией
+    
+    Args:
+        records: Записи вида {поле: текст} для полей LONG_TEXT_FIELDS
+        
+    Returns:
+        list[int]: Ключи сохраненных записей в порядке records
+    """
+    columns_sql = ", ".join(_quote(field) for field in LONG_TEXT_FIELDS)
+    placeholders = ", ".join("?" for _ in LONG_TEXT_FIELDS)
+    query = f"INSERT INTO texts ({columns_sql}) VALUES ({placeholders})"
+    
+    keys = []
+    with _connection() as conn:
+        for record in records:
+            cursor = conn.execute(query, [record.get(field) for field in LONG_TEXT_FIELDS])
+            keys.append(cursor.lastrowid)
+    return keys
+
+
+@profiled(reads_file=True)
+def get_texts(keys: list[int]) -> dict[int, dict[str, str]]:
+    """
+    Возвращает тексты отчетов по ключам
+    
+    Args:
+        keys: Ключи записей
+        
+    Returns:
+        dict[int, dict[str, str]]: {ключ: {поле: текст}}; пустые поля пропускаются,
+            отсутствующих ключей в словаре нет
+    """
+    keys = sorted({int(key) for key in keys})
+    if not keys:
+        return {}
+    
+    columns_sql = ", ".join(_quote(field) for field in LONG_TEXT_FIELDS)
+    texts = {}
+    with _connection() as conn:
+        # Ограничение SQLite на число параметров запроса
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT id, {columns_sql} FROM texts "
+                f"WHERE id IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            )
+            for key, *values in rows:
+                texts[key] = {
+                    field: value
+                    for field, value in zip(LONG_TEXT_FIELDS, values)
+                    if value
+                }
+    return texts
+
@@ -3,7 +3,6 @@
 """
 
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 from config import (
     CATEGORIES,
@@ -11,21 +10,18 @@ from config import (
     NUMERIC_METRICS,
     TEXT_METRIC,
     STAGE_OPTIONS,
-    NEW_TEXT_FIELDS
-)
-from data_manager import (
-    load_data,
-    save_data,
-    create_data_row,
-    calculate_overall_score,
-    update_default_value,
-    get_default_value
-)
-from visualization import (
-    create_radar_chart,
-    create_bar_chart,
-    get_chart_config
+    NEW_TEXT_FIELDS,
+    REPORTS_REFRESH_INTERVAL
 )
+from autocomplete import update_default_values, get_default_value
+from suggestions import get_suggestions
+from scores import calculate_overall_score
+from profiling import profiled
+
+# Модули data_manager (pandas) и visualization импортируются внутри функций,
+# которым они нужны: первая отрисовка страницы ввода данных обходится без
+# их загрузки, повторный импорт берется из sys.modules. Сам plotly.graph_objects
+# загружается уже при импорте streamlit
 
 
 def setup_page_style() -> None:
@@ -66,10 +62,94 @@ def render_header() -> None:
     )
 
 
+def retain_widget_state(category_label: str) -> None:
+    """
+    Сохраняет значения виджетов невыбранной вкладки до ее следующего открытия
+    
+    Streamlit удаляет состояние виджетов, которые не отрисованы в текущем
+    запуске, поэтому значения переносятся в обычное состояние сессии.
+    Сохраняются только значения, уже переданные на сервер: поля формы
+    (st.form) передаются лишь при ее отправке, поэтому вкладки с формами
+    так не сохранить.
+    
+    Args:
+        category_label: Название категории (суффикс ключей виджетов вкладки)
+    """
+    suffix = f"_{category_label}"
+    for key in list(st.session_state.keys()):
+        if isinstance(key, str) and key.endswith(suffix):
+            st.session_state[key] = st.session_state[key]
+
+
+@st.fragment
+@profiled
+def render_metrics_fragment(category_label: str) -> None:
+    """
+    Отображает слайдеры метрик с предпросмотром общей цифры
+    
+    Фрагмент перезапускается отдельно от страницы, поэтому движение слайдера
+    пересчитывает только общую цифру. Значения читаются при сохранении формы
+    из состояния сессии по ключам слайдеров.
+    
+    Args:
+        category_label: Название категории
+    """
+    st.markdown("### Метрики")
+    columns = st.columns(2)
+    values = []
+    for i, metric in enumerate(METRICS):
+        with columns[i % 2]:
+            values.append(st.slider(
+                metric,
+                0.0, 10.0, 5.0, 0.1,
+                key=f"m{i + 1}_{category_label}"
+            ))
+    
+    # Расчет и отображение общей цифры
+    overall = calculate_overall_score(values)
+    st.metric("Общая цифра", overall)
+
+
+def render_suggestion_input(field: str, default: str, key: str) -> str:
+    """
+    Отображает поле ввода с подсказками ранее введенных значений
+    
+    Подсказки упорядочены по частоте и давности использования (см. модуль
+    suggestions) и отбираются по началу введенного текста; допускается
+    ввод нового значения.
+    
+    Args:
+        field: Название поля из SUGGESTION_FIELDS
+        default: Значение по умолчанию
+        key: Ключ виджета
+        
+    Returns:
+        str: Выбранное или введенное значение (пустая строка, если не задано)
+    """
+    options = get_suggestions(field)
+    if default and default not in options:
+        options = [default] + options
+    value = st.selectbox(
+        field + ":",
+        options,
+        index=options.index(default) if default else None,
+        key=key,
+        placeholder="Введите значение...",
+        accept_new_options=True,
+        filter_mode="prefix"
+    )
+    return value or ""
+
+
+@profiled
 def render_data_input_tab(tab, category_label: str) -> None:
     """
     Отображает форму ввода данных для категории
     
+    Поля ввода собраны в форму и не перезапускают приложение до сохранения.
+    Вне формы остаются выбор направления (от него зависят значения
+    по умолчанию) и фрагмент со слайдерами метрик.
+    
     Args:
         tab: Streamlit tab объект
         category_label: Название категории
@@ -85,153 +165,140 @@ def render_data_input_tab(tab, category_label: str) -> None:
             key=f"input_{category_label}"
         )
         
-        # Стадия
-        stage = st.selectbox(
-            "Стадия:",
-            STAGE_OPTIONS,
-            key=f"stage_{category_label}"
-        )
-        
-        # Лидер (с запоминанием последнего значения для направления)
-        leader_default = get_default_value(direction, NEW_TEXT_FIELDS[0])
-        leader = st.text_input(
-            NEW_TEXT_FIELDS[0] + ":",
-            value=leader_default,
-            key=f"leader_{category_label}",
-            placeholder="Введите значение..."
-        )
+        # Слайдеры для метрик
+        render_metrics_fragment(category_label)
         
         st.markdown("---")
         
-        # Ввод месяца
-        month = st.text_input(
-            "Месяц (например, 2025-08):",
-            value=datetime.now().strftime("%Y-%m"),
-            key=f"month_{category_label}"
-        )
-        
-        # Слайдеры для метрик
-        st.markdown("### Метрики")
-        col1, col2 = st.columns(2)
-        with col1:
-            m1 = st.slider(
-                METRICS[0],
-                0.0, 10.0, 5.0, 0.1,
-                key=f"m1_{category_label}"
+        with st.form(key=f"form_{category_label}", border=False):
+            # Стадия
+            stage = st.selectbox(
+                "Стадия:",
+                STAGE_OPTIONS,
+                key=f"stage_{category_label}"
             )
-            m2 = st.slider(
-                METRICS[1],
-                0.0, 10.0, 5.0, 0.1,
-                key=f"m2_{category_label}"
+            
+            # Лидер (с запоминанием последнего значения для направления и подсказками из истории)
+            leader = render_suggestion_input(
+                NEW_TEXT_FIELDS[0],
+                get_default_value(direction, NEW_TEXT_FIELDS[0]),
+                key=f"leader_{category_label}"
             )
-        with col2:
-            m3 = st.slider(
-                METRICS[2],
-                0.0, 10.0, 5.0, 0.1,
-                key=f"m3_{category_label}"
+            
+            # Ввод месяца
+            month = st.text_input(
+                "Месяц (например, 2025-08):",
+                value=datetime.now().strftime("%Y-%m"),
+                key=f"month_{category_label}"
             )
-            m4 = st.slider(
-                METRICS[3],
-                0.0, 10.0, 5.0, 0.1,
-                key=f"m4_{category_label}"
+            
+            st.markdown("---")
+            
+            # Числовые метрики
+            st.markdown("### Финансовые показатели")
+            col3, col4 = st.columns(2)
+            with col3:
+                portfolio = st.number_input(
+                    NUMERIC_METRICS[0],
+                    min_value=0.0,
+                    step=0.1,
+                    key=f"portf_{category_label}"
+                )
+            with col4:
+                ambition = st.number_input(
+                    NUMERIC_METRICS[1],
+                    min_value=0.0,
+                    step=0.1,
+                    key=f"amb_{category_label}"
+                )
+            
+            # Текстовая метрика
+            value_text = st.text_input(
+                TEXT_METRIC,
+                key=f"text_{category_label}"
             )
-        
-        # Расчет и отображение общей цифры
-        overall = calculate_overall_score([m1, m2, m3, m4])
-        st.metric("Общая цифра", overall)
-        
-        st.markdown("---")
-        
-        # Числовые метрики
-        st.markdown("### Финансовые показатели")
-        col3, col4 = st.columns(2)
-        with col3:
-            portfolio = st.number_input(
-                NUMERIC_METRICS[0],
-                min_value=0.0,
-                step=0.1,
-                key=f"portf_{category_label}"
+            
+            st.markdown("---")
+            
+            # Новые текстовые поля с автозаполнением
+            st.markdown("### Дополнительная информация")
+            
+            # Магниты (с запоминанием последнего значения для направления)
+            magnets_default = get_default_value(direction, NEW_TEXT_FIELDS[1])
+            magnets = st.text_area(
+                NEW_TEXT_FIELDS[1] + ":",
+                value=magnets_default,
+                key=f"magnets_{category_label}",
+                placeholder="Введите значение...",
+                height=100
             )
-        with col4:
-            ambition = st.number_input(
-                NUMERIC_METRICS[1],
-                min_value=0.0,
-                step=0.1,
-                key=f"amb_{category_label}"
+            
+            # Источник финансирования (с запоминанием последнего значения для направления и подсказками из истории)
+            funding_source = render_suggestion_input(
+                NEW_TEXT_FIELDS[2],
+                get_default_value(direction, NEW_TEXT_FIELDS[2]),
+                key=f"funding_{category_label}"
+            )
+            
+            # Стратегия (с запоминанием последнего значения для направления)
+            strategy_default = get_default_value(direction, NEW_TEXT_FIELDS[3])
+            strategy = st.text_area(
+                NEW_TEXT_FIELDS[3] + ":",
+                value=strategy_default,
+                key=f"strategy_{category_label}",
+                placeholder="Введите значение...",
+                height=100
+            )
+            
+            # Управленческие решения (с запоминанием последнего значения для направления)
+            decisions_default = get_default_value(direction, NEW_TEXT_FIELDS[4])
+            management_decisions = st.text_input(
+                NEW_TEXT_FIELDS[4] + ":",
+                value=decisions_default,
+                key=f"decisions_{category_label}",
+                placeholder="Введите значение..."
+            )
+            
+            st.markdown("<br>", unsafe_allow_html=True)
+            
+            # Кнопка сохранения
+            submitted = st.form_submit_button(
+                "📂 Сохранить отчет",
+                key=f"save_{category_label}",
+                use_container_width=True
             )
-        
-        # Текстовая метрика
-        value_text = st.text_input(
-            TEXT_METRIC,
-            key=f"text_{category_label}"
-        )
-        
-        st.markdown("---")
-        
-        # Новые текстовые поля с автозаполнением
-        st.markdown("### Дополнительная информация")
-        
-        # Магниты (с запоминанием последнего значения для направления)
-        magnets_default = get_default_value(direction, NEW_TEXT_FIELDS[1])
-        magnets = st.text_area(
-            NEW_TEXT_FIELDS[1] + ":",
-            value=magnets_default,
-            key=f"magnets_{category_label}",
-            placeholder="Введите значение...",
-            height=100
-        )
-        
-        # Источник финансирования (с запоминанием последнего значения для направления)
-        funding_default = get_default_value(direction, NEW_TEXT_FIELDS[2])
-        funding_source = st.text_input(
-            NEW_TEXT_FIELDS[2] + ":",
-            value=funding_default,
-            key=f"funding_{category_label}",
-            placeholder="Введите значение..."
-        )
-        
-        # Стратегия (с запоминанием последнего значения для направления)
-        strategy_default = get_default_value(direction, NEW_TEXT_FIELDS[3])
-        strategy = st.text_area(
-            NEW_TEXT_FIELDS[3] + ":",
-            value=strategy_default,
-            key=f"strategy_{category_label}",
-            placeholder="Введите значение...",
-            height=100
-        )
-        
-        # Управленческие решения (с запоминанием последнего значения для направления)
-        decisions_default = get_default_value(direction, NEW_TEXT_FIELDS[4])
-        management_decisions = st.text_input(
-            NEW_TEXT_FIELDS[4] + ":",
-            value=decisions_default,
-            key=f"decisions_{category_label}",
-            placeholder="Введите значение..."
-        )
         
         st.markdown("</div>", unsafe_allow_html=True)
-        st.markdown("<br>", unsafe_allow_html=True)
         
-        # Кнопка сохранения
-        if st.button("📂 Сохранить отчет", key=f"save_{category_label}", use_container_width=True):
-            # Обновляем последние значения для направления
-            if leader and leader.strip():
-                update_default_value(direction, NEW_TEXT_FIELDS[0], leader)
-            if magnets and magnets.strip():
-                update_default_value(direction, NEW_TEXT_FIELDS[1], magnets)
-            if funding_source and funding_source.strip():
-                update_default_value(direction, NEW_TEXT_FIELDS[2], funding_source)
-            if strategy and strategy.strip():
-                update_default_value(direction, NEW_TEXT_FIELDS[3], strategy)
-            if management_decisions and management_decisions.strip():
-                update_default_value(direction, NEW_TEXT_FIELDS[4], management_decisions)
+        if submitted:
+            from data_manager import normalize_month, create_data_row, append_report
+            
+            try:
+                month = normalize_month(month)
+            except ValueError as error:
+                st.error(f"❌ {error}")
+                return
+            
+            # Значения слайдеров из фрагмента
+            metrics = [
+                st.session_state[f"m{i}_{category_label}"]
+                for i in range(1, len(METRICS) + 1)
+            ]
+            
+            # Обновляем последние значения для направления одной записью
+            update_default_values(direction, {
+                NEW_TEXT_FIELDS[0]: leader,
+                NEW_TEXT_FIELDS[1]: magnets,
+                NEW_TEXT_FIELDS[2]: funding_source,
+                NEW_TEXT_FIELDS[3]: strategy,
+                NEW_TEXT_FIELDS[4]: management_decisions
+            })
             
-            df = load_data()
             new_row = create_data_row(
                 direction=direction,
                 month=month,
                 stage=stage,
-                metrics=[m1, m2, m3, m4],
+                metrics=metrics,
                 portfolio=portfolio,
                 ambition=ambition,
                 value_text=value_text,
@@ -241,36 +308,87 @@ def render_data_input_tab(tab, category_label: str) -> None:
                 strategy=strategy or "",
                 management_decisions=management_decisions or ""
             )
-            df = pd.concat([df, new_row], ignore_index=True)
-            save_data(df)
+            append_report(new_row)
             st.success("✅ Отчет сохранен!")
 
 
+@profiled
+def render_bulk_import() -> None:
+    """Отображает загрузку исторических отчетов из CSV/XLSX файла"""
+    with st.expander("📥 Массовый импорт отчетов", expanded=False):
+        st.caption(
+            "Файл CSV или XLSX с колонками как в выгрузке данных. "
+            "Общая цифра рассчитывается автоматически."
+        )
+        uploaded = st.file_uploader(
+            "Файл с отчетами:",
+            type=["csv", "xlsx"],
+            key="bulk_import_file"
+        )
+        if uploaded is None:
+            return
+        
+        if st.button("📂 Импортировать", key="bulk_import_submit", use_container_width=True):
+            from data_manager import read_reports_file, import_reports
+            
+            try:
+                df = read_reports_file(uploaded, uploaded.name)
+                imported, errors = import_reports(df)
+            except (ValueError, ImportError) as error:
+                st.error(f"Не удалось импортировать файл: {error}")
+                return
+            
+            if imported:
+                st.success(f"✅ Импортировано отчетов: {imported}")
+            if not errors.empty:
+                st.warning(f"Пропущено строк с ошибками: {len(errors)}")
+                st.dataframe(errors, use_container_width=True, hide_index=True)
+
+
+@profiled
 def render_data_input_page() -> None:
     """Отображает страницу ввода данных"""
     st.header("📝 Ввод метрик по направлению")
     
-    tab1, tab2, tab3 = st.tabs(list(CATEGORIES.keys()))
+    render_bulk_import()
+    
+    # Вкладки ввода отрисовываются все: значения полей формы попадают на сервер
+    # только при сохранении, и недописанный текст хранится лишь в браузере,
+    # пока вкладка остается на странице
+    tabs = st.tabs(list(CATEGORIES.keys()))
     
-    for category_label, tab in zip(CATEGORIES.keys(), [tab1, tab2, tab3]):
+    for category_label, tab in zip(CATEGORIES.keys(), tabs):
         render_data_input_tab(tab, category_label)
 
 
-def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
+@profiled
+def render_reports_tab(tab, category_label: str) -> None:
     """
     Отображает отчеты для конкретной категории
     
     Args:
         tab: Streamlit tab объект
         category_label: Название категории
-        df: DataFrame с данными
     """
+    import pandas as pd
+    from data_manager import (
+        get_report_directions,
+        get_report_months,
+        get_report,
+        get_report_texts,
+        get_report_revisions,
+        get_direction_rollup,
+        get_reports_version
+    )
+    from visualization import create_radar_chart, create_bar_chart, get_chart_config
+    
     with tab:
-        # Фильтруем данные по категории
-        category_directions = CATEGORIES[category_label]
-        category_df = df[df["Направление"].isin(category_directions)]
+        watch_report_updates(category_label, get_reports_version(category_label))
+        
+        # Направления категории, по которым есть данные
+        directions = get_report_directions(CATEGORIES[category_label])
         
-        if category_df.empty:
+        if not directions:
             st.info(f"Данных по категории '{category_label}' пока нет.")
             return
         
@@ -279,16 +397,17 @@ def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
         with col_select1:
             selected_direction = st.selectbox(
                 "Выберите направление:",
-                category_df["Направление"].unique(),
+                directions,
                 key=f"report_dir_{category_label}"
             )
         
         with col_select2:
-            months = category_df[category_df["Направление"] == selected_direction]["Месяц"].unique()
+            months = get_report_months(selected_direction)
             if len(months) > 0:
+                # Месяцы хранятся по возрастанию; в списке сначала последний
                 selected_month = st.selectbox(
                     "Выберите месяц:",
-                    months,
+                    months[::-1],
                     key=f"report_month_{category_label}"
                 )
             else:
@@ -296,10 +415,10 @@ def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
                 return
         
         # Получение данных для выбранного направления и месяца
-        row = category_df[
-            (category_df["Направление"] == selected_direction) &
-            (category_df["Месяц"] == selected_month)
-        ].iloc[-1]
+        row = get_report(selected_direction, selected_month)
+        if row is None:
+            st.info("Нет данных для выбранного месяца")
+            return
         
         # Заголовок с информацией о направлении
         st.markdown(
@@ -329,7 +448,8 @@ def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
             metrics_data = {}
             for metric in METRICS:
                 if metric in row and pd.notna(row[metric]):
-                    metrics_data[metric] = row[metric]
+                    # Оценки хранятся во float32 — округляем для отображения
+                    metrics_data[metric] = round(float(row[metric]), 2)
             
             if metrics_data:
                 metrics_df = pd.DataFrame(list(metrics_data.items()), columns=["Метрика", "Значение"])
@@ -348,7 +468,7 @@ def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
         with col_right:
             st.markdown("### 📈 Радиальная диаграмма")
             if all(m in row and pd.notna(row[m]) for m in METRICS):
-                fig = create_radar_chart([row[m] for m in METRICS])
+                fig = create_radar_chart([round(float(row[m]), 2) for m in METRICS])
                 st.plotly_chart(
                     fig,
                     use_container_width=True,
@@ -362,12 +482,14 @@ def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
         # Дополнительная информация
         st.markdown("### 📝 Дополнительная информация")
         
-        additional_info = {}
-        if TEXT_METRIC in row and pd.notna(row[TEXT_METRIC]) and row[TEXT_METRIC]:
-            additional_info[TEXT_METRIC] = row[TEXT_METRIC]
+        # Длинные тексты хранятся отдельно и читаются только для показанного отчета
+        texts = get_report_texts(row)
         
-        for field in NEW_TEXT_FIELDS:
-            if field in row and pd.notna(row[field]) and row[field]:
+        additional_info = {}
+        for field in [TEXT_METRIC] + NEW_TEXT_FIELDS:
+            if field in texts:
+                additional_info[field] = texts[field]
+            elif field in row and pd.notna(row[field]) and row[field]:
                 additional_info[field] = row[field]
         
         if additional_info:
@@ -377,6 +499,14 @@ def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
         else:
             st.info("Дополнительная информация не заполнена")
         
+        # Предыдущие версии отчета читаются из архива только по запросу
+        if st.toggle("🕘 Предыдущие версии отчета", key=f"report_revisions_{category_label}"):
+            revisions = get_report_revisions(selected_direction, selected_month)
+            if revisions.empty:
+                st.info("Отчет за этот месяц не переотправлялся")
+            else:
+                st.dataframe(revisions, use_container_width=True, hide_index=True)
+        
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Столбчатые диаграммы
@@ -384,36 +514,165 @@ def render_reports_tab(tab, category_label: str, df: pd.DataFrame) -> None:
         chart_cols = st.columns(2)
         
         with chart_cols[0]:
-            if NUMERIC_METRICS[0] in category_df.columns:
-                bar1 = create_bar_chart(
-                    category_df[category_df["Направление"] == selected_direction],
-                    NUMERIC_METRICS[0],
-                    NUMERIC_METRICS[0]
-                )
-                st.plotly_chart(bar1, use_container_width=True, config=get_chart_config())
+            rollup1 = get_direction_rollup(selected_direction, NUMERIC_METRICS[0])
+            bar1 = create_bar_chart(rollup1["mean"], NUMERIC_METRICS[0])
+            st.plotly_chart(bar1, use_container_width=True, config=get_chart_config())
         
         with chart_cols[1]:
-            if NUMERIC_METRICS[1] in category_df.columns:
-                bar2 = create_bar_chart(
-                    category_df[category_df["Направление"] == selected_direction],
-                    NUMERIC_METRICS[1],
-                    NUMERIC_METRICS[1]
-                )
-                st.plotly_chart(bar2, use_container_width=True, config=get_chart_config())
+            rollup2 = get_direction_rollup(selected_direction, NUMERIC_METRICS[1])
+            bar2 = create_bar_chart(rollup2["mean"], NUMERIC_METRICS[1])
+            st.plotly_chart(bar2, use_container_width=True, config=get_chart_config())
 
 
+@st.fragment(run_every=REPORTS_REFRESH_INTERVAL or None)
+def watch_report_updates(category_label: str | None, shown_version: tuple) -> None:
+    """
+    Проверяет по таймеру, появились ли новые отчеты показанной категории
+    
+    Фрагмент ничего не выводит. Проверка сравнивает версии в памяти процесса:
+    пока файлы данных не менялись, она не обращается к диску, а новые строки
+    дочитываются без полной загрузки данных. Страница перерисовывается только
+    при изменении отчетов этой категории; перерисовывается лишь открытая
+    вкладка (см. render_reports_page).
+    
+    Args:
+        category_label: Название категории (None — все категории)
+        shown_version: Версия отчетов, с которой отрисована страница
+            (см. get_reports_version)
+    """
+    from data_manager import get_reports_version
+    
+    if get_reports_version(category_label) != shown_version:
+        st.rerun()
+
+
+def render_undated_reports() -> None:
+    """Предупреждает об отчетах с нераспознанным месяцем: они не показываются"""
+    from data_manager import get_undated_reports
+    
+    undated = get_undated_reports()
+    if undated.empty:
+        return
+    st.warning(
+        f"Отчетов с нераспознанным месяцем: {len(undated)}. Они не показываются "
+        "в отчетах и обзоре — исправьте месяц на формат YYYY-MM."
+    )
+    with st.expander("Отчеты с нераспознанным месяцем", expanded=False):
+        st.dataframe(undated, use_container_width=True, hide_index=True)
+
+
+@profiled
 def render_reports_page() -> None:
     """Отображает страницу отчетов"""
-    st.header("📈 Отчеты и диаграммы")
+    from data_manager import has_reports, get_reports_version
     
-    df = load_data()
+    st.header("📈 Отчеты и диаграммы")
+    render_undated_reports()
     
-    if df.empty:
+    if not has_reports():
         st.info("Данных пока нет. Введите хотя бы один отчет.")
+        watch_report_updates(None, get_reports_version())
         return
     
     # Подвкладки для категорий
-    report_tabs = st.tabs(list(CATEGORIES.keys()))
+    report_tabs = st.tabs(list(CATEGORIES.keys()), key="report_category", on_change="rerun")
     
     for category_label, tab in zip(CATEGORIES.keys(), report_tabs):
-        render_reports_tab(tab, category_label, df)
+        # Вычисляется только содержимое выбранной вкладки
+        if tab.open:
+            render_reports_tab(tab, category_label)
+        else:
+            retain_widget_state(category_label)
+
+
+@profiled
+def render_overview_page() -> None:
+    """Отображает сводную карту всех направлений по месяцам"""
+    from data_manager import has_reports, get_overview, OVERVIEW_METRICS
+    from visualization import create_heatmap, get_chart_config
+    
+    st.header("🗺️ Обзор направлений")
+    render_undated_reports()
+    
+    if not has_reports():
+        st.info("Данных пока нет. Введите хотя бы один отчет.")
+        return
+    
+    col_metric, col_period = st.columns(2)
+    with col_metric:
+        metric = st.selectbox("Метрика:", OVERVIEW_METRICS, key="overview_metric")
+    
+    months = list(get_overview(metric).columns)
+    start, end = months[0], months[-1]
+    if len(months) > 1:
+        with col_period:
+            # По умолчанию показываются последние 12 месяцев
+            start, end = st.select_slider(
+                "Период:",
+                options=months,
+                value=(months[max(0, len(months) - 12)], months[-1]),
+                format_func=str,
+                key="overview_period"
+            )
+    
+    st.plotly_chart(
+        create_heatmap(get_overview(metric, start, end), metric),
+        use_container_width=True,
+        config=get_chart_config()
+    )
+
+
+@profiled
+def render_search_page() -> None:
+    """Отображает страницу поиска по текстовым полям отчетов"""
+    from search import search_reports
+    
+    st.header("🔎 Поиск по отчетам")
+    
+    query = st.text_input(
+        "Слова для поиска:",
+        key="search_query",
+        placeholder="Например: поставщик риски"
+    )
+    if not query.strip():
+        st.caption(
+            "Поиск идет по полям " + ", ".join(f"«{field}»" for field in [TEXT_METRIC] + NEW_TEXT_FIELDS)
+            + " последних отчетов; находятся отчеты, содержащие все слова запроса в любой форме."
+        )
+        return
+    
+    results = search_reports(query)
+    if not results:
+        st.info("Ничего не найдено.")
+        return
+    
+    st.caption(f"Найдено отчетов: {len(results)}")
+    for result in results:
+        st.markdown(f"**{result['Направление']}** — {result['Месяц']}")
+        if result["field"]:
+            st.caption(f"{result['field']}: {result['snippet']}")
+
+
+def render_diagnostics_panel(report: dict) -> None:
+    """
+    Отображает в боковом меню замеры последнего перезапуска
+    
+    Args:
+        report: Замеры перезапуска (см. profiling.finish_rerun)
+    """
+    import pandas as pd
+    
+    with st.sidebar.expander("⏱️ Диагностика", expanded=False):
+        col1, col2 = st.columns(2)
+        col1.metric("Перезапуск, мс", round(report["total"] * 1000, 1))
+        col2.metric("Чтений файлов", report["file_reads"])
+        
+        if not report["functions"]:
+            st.caption("Замеренные функции не вызывались")
+            return
+        
+        # Время вложенных вызовов входит во время внешних
+        table = pd.DataFrame.from_dict(report["functions"], orient="index")
+        table["time"] = (table["time"] * 1000).round(2)
+        table = table.rename(columns={"calls": "Вызовы", "time": "Время, мс"})
+        st.dataframe(table.sort_values("Время, мс", ascending=False), use_container_width=True)
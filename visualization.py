@@ -2,29 +2,50 @@
 Модуль для создания визуализаций
 """
 
+from functools import lru_cache
 import plotly.graph_objects as go
 import pandas as pd
 from config import (
     METRICS,
     NUMERIC_METRICS,
     COLORS,
-    CHART_CONFIG
+    CHART_CONFIG,
+    FIGURE_CACHE_SIZE
 )
+from profiling import profiled
 
 
+@profiled
 def create_radar_chart(metrics_values: list[float]) -> go.Figure:
     """
     Создает радиальную диаграмму (spider chart) для метрик
     
+    Фигуры кэшируются по значениям метрик: для тех же значений возвращается
+    уже построенный объект, поэтому его нельзя изменять.
+    
     Args:
         metrics_values: Список значений метрик
         
+    Returns:
+        go.Figure: Объект фигуры Plotly
+    """
+    return _build_radar_chart(tuple(float(value) for value in metrics_values))
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _build_radar_chart(metrics_values: tuple[float, ...]) -> go.Figure:
+    """
+    Строит радиальную диаграмму (результат кэшируется)
+    
+    Args:
+        metrics_values: Значения метрик
+        
     Returns:
         go.Figure: Объект фигуры Plotly
     """
     # Замыкаем круг для визуализации
     labels = METRICS + [METRICS[0]]
-    values = metrics_values + [metrics_values[0]]
+    values = list(metrics_values) + [metrics_values[0]]
     
     fig = go.Figure()
     
@@ -61,32 +82,55 @@ def create_radar_chart(metrics_values: list[float]) -> go.Figure:
     return fig
 
 
+@profiled
 def create_bar_chart(
-    df: pd.DataFrame,
-    column: str,
+    values: pd.Series,
     title: str
 ) -> go.Figure:
     """
     Создает столбчатую диаграмму для числовых метрик
     
+    Фигуры кэшируются по месяцам, значениям и заголовку: для тех же данных
+    возвращается уже построенный объект, поэтому его нельзя изменять.
+    
     Args:
-        df: DataFrame с данными
-        column: Название колонки для отображения
+        values: Агрегированные значения метрики, индекс — месяцы
+            (см. data_manager.get_direction_rollup)
         title: Заголовок диаграммы
         
     Returns:
         go.Figure: Объект фигуры Plotly
     """
-    # Фильтруем и группируем данные
-    filtered = df.dropna(subset=[column])
-    grouped = filtered.groupby("Месяц")[column].mean().reset_index()
+    return _build_bar_chart(
+        tuple(values.index.astype(str)),
+        tuple(float(value) for value in values),
+        title
+    )
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _build_bar_chart(
+    months: tuple[str, ...],
+    values: tuple[float, ...],
+    title: str
+) -> go.Figure:
+    """
+    Строит столбчатую диаграмму (результат кэшируется)
     
+    Args:
+        months: Подписи месяцев
+        values: Значения метрики по месяцам
+        title: Заголовок диаграммы
+        
+    Returns:
+        go.Figure: Объект фигуры Plotly
+    """
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        x=grouped["Месяц"],
-        y=grouped[column],
-        text=grouped[column].round(2),
+        x=list(months),
+        y=list(values),
+        text=[round(value, 2) for value in values],
         textposition='outside',
         textfont=dict(size=16),
         marker=dict(color=COLORS["primary"])
@@ -105,6 +149,79 @@ def create_bar_chart(
     return fig
 
 
+@profiled
+def create_heatmap(values: pd.DataFrame, title: str) -> go.Figure:
+    """
+    Создает тепловую карту метрики по направлениям и месяцам
+    
+    Фигуры кэшируются по подписям, значениям и заголовку: для тех же данных
+    возвращается уже построенный объект, поэтому его нельзя изменять.
+    
+    Args:
+        values: Значения метрики, строки — направления, колонки — месяцы
+            (см. data_manager.get_overview)
+        title: Заголовок диаграммы
+        
+    Returns:
+        go.Figure: Объект фигуры Plotly
+    """
+    return _build_heatmap(
+        tuple(values.index.astype(str)),
+        tuple(values.columns.astype(str)),
+        tuple(
+            tuple(None if pd.isna(value) else float(value) for value in row)
+            for row in values.to_numpy()
+        ),
+        title
+    )
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _build_heatmap(
+    directions: tuple[str, ...],
+    months: tuple[str, ...],
+    values: tuple[tuple[float | None, ...], ...],
+    title: str
+) -> go.Figure:
+    """
+    Строит тепловую карту (результат кэшируется)
+    
+    Args:
+        directions: Подписи направлений
+        months: Подписи месяцев
+        values: Значения метрики по направлениям и месяцам (None — нет отчета)
+        title: Заголовок диаграммы
+        
+    Returns:
+        go.Figure: Объект фигуры Plotly
+    """
+    fig = go.Figure()
+    
+    fig.add_trace(go.Heatmap(
+        z=[list(row) for row in values],
+        x=list(months),
+        y=list(directions),
+        colorscale=COLORS["heatmap"],
+        texttemplate="%{z:.2f}",
+        hoverongaps=False,
+        xgap=2,
+        ygap=2
+    ))
+    
+    fig.update_layout(
+        title=f"🗺️ {title}",
+        height=max(300, 40 * len(directions) + 150),
+        plot_bgcolor=COLORS["background"],
+        paper_bgcolor=COLORS["background"],
+        font=dict(color=COLORS["text"], size=14),
+        xaxis=dict(type="category", title="Месяц"),
+        yaxis=dict(autorange="reversed"),
+        margin=dict(t=50, b=50)
+    )
+    
+    return fig
+
+
 def get_chart_config() -> dict:
     """
     Возвращает конфигурацию для отображения графиков